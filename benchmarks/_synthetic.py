@@ -0,0 +1,90 @@
+# SPDX-FileCopyrightText: 2022-present Angus Hollands <goosey15@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""Generators of synthetic ``package.json`` documents."""
+from __future__ import annotations
+
+import json
+import random
+from typing import Any
+
+VERSION_LABELS = ("a", "b", "c", "rc", "alpha", "beta", "pre", "preview")
+
+
+def make_node_versions(count: int, seed: int = 0) -> list[str]:
+    """Return ``count`` valid Node.js versions, mostly plain releases."""
+    rng = random.Random(seed)
+    versions = []
+    for _ in range(count):
+        version = f"{rng.randrange(50)}.{rng.randrange(100)}.{rng.randrange(1000)}"
+        kind = rng.random()
+        if kind < 0.1:
+            version += f"-{rng.choice(VERSION_LABELS)}{rng.randrange(10)}"
+        elif kind < 0.15:
+            version += f"-{rng.choice(VERSION_LABELS)}{rng.randrange(10)}.dev0"
+        elif kind < 0.2:
+            version += f"-dev{rng.randrange(10)}+build.{rng.randrange(1000)}"
+        versions.append(version)
+    return versions
+
+
+def make_people(count: int, seed: int = 0) -> list[Any]:
+    rng = random.Random(seed)
+    people = []
+    for i in range(count):
+        kind = rng.random()
+        if kind < 0.5:
+            people.append(
+                f"Person {i} <person{i}@example.com> (https://example.com/{i})"
+            )
+        elif kind < 0.8:
+            people.append({"name": f"Person {i}", "email": f"person{i}@example.com"})
+        else:
+            people.append(f"Person {i}")
+    return people
+
+
+def make_package(
+    size: int = 0,
+    contributors: int = 0,
+    version: str = "1.2.3",
+    name: str = "my-app",
+    seed: int = 0,
+) -> dict[str, Any]:
+    """Return a package.json document of roughly ``size`` bytes when serialized
+    with an indent of 2, padded with a ``dependencies`` block and a ``files``
+    list.
+    """
+    package = {
+        "name": name,
+        "version": version,
+        "description": "A synthetic package",
+        "keywords": ["synthetic", "benchmark"],
+        "homepage": "https://example.com",
+        "bugs": {"url": "https://example.com/issues"},
+        "license": "MIT",
+        "author": "Alice Roberts <alice.roberts@example.com>",
+        "contributors": make_people(contributors, seed),
+        "repository": "github:example/my-app",
+        "scripts": {"build": "tsc", "test": "jest"},
+        "dependencies": {},
+        "files": [],
+    }
+
+    padding = size - len(json.dumps(package, indent=2))
+    # Each dependency adds about 32 bytes, and each file about 34 bytes
+    dependencies = max(0, padding // 2 // 32)
+    files = max(0, padding // 2 // 34)
+    package["dependencies"] = {
+        f"dependency-{i:07d}": f"^{i % 100}.{i % 7}.0" for i in range(dependencies)
+    }
+    package["files"] = [f"dist/chunks/file-{i:08d}.js" for i in range(files)]
+    return package
+
+
+def write_package(path, **kwargs) -> int:
+    """Write a synthetic package.json to ``path``, returning its size."""
+    data = json.dumps(make_package(**kwargs), indent=2).encode("utf-8") + b"\n"
+    with open(path, "wb") as f:
+        f.write(data)
+    return len(data)
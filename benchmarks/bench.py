@@ -0,0 +1,292 @@
+# SPDX-FileCopyrightText: 2022-present Angus Hollands <goosey15@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""Offline micro-benchmarks, with a regression gate against stored baselines.
+
+    python benchmarks/bench.py [--quick] [--save | --compare] [--baseline PATH]
+
+Timings are reported relative to a fixed pure-Python calibration workload run
+on the same machine, so that baselines recorded on one machine remain
+meaningful on another. With ``--compare``, the process exits with a non-zero
+status if any benchmark is slower than its baseline by more than
+``--tolerance``.
+
+Benchmarks bound by I/O (e.g. ``set_version``, which waits for ``fsync``) do
+not scale with the calibration workload, so they are reported by ``--compare``
+but only gated if ``--io-tolerance`` is given.
+"""
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import timeit
+from typing import Callable
+
+from _synthetic import make_node_versions, write_package
+
+from hatch_nodejs_version._person import person_cache_clear
+from hatch_nodejs_version.cache import package_json_cache
+from hatch_nodejs_version.metadata_source import NodeJSMetadataHook
+from hatch_nodejs_version.version_source import (
+    NodeJSVersionSource,
+    conversion_cache_clear,
+)
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+KB = 1 << 10
+MB = 1 << 20
+SIZES = {"1KB": KB, "1MB": MB, "10MB": 10 * MB, "50MB": 50 * MB}
+QUICK_SIZES = ("1KB", "1MB")
+CONTRIBUTORS = (10, 100, 1000, 10000)
+QUICK_CONTRIBUTORS = (10, 100, 1000)
+
+# name -> (factory, quick, io), where factory(workdir) returns the function to
+# time, and io marks benchmarks that are bound by I/O rather than the CPU
+BENCHMARKS: dict[str, tuple[Callable[[str], Callable[[], object]], bool, bool]] = {}
+
+
+def benchmark(name: str, quick: bool = True, io: bool = False):
+    def decorator(factory):
+        BENCHMARKS[name] = (factory, quick, io)
+        return factory
+
+    return decorator
+
+
+def clear_caches():
+    package_json_cache.cache_clear()
+    conversion_cache_clear()
+    person_cache_clear()
+
+
+def calibration():
+    sorted(str(i * 7919 % 10007) for i in range(20000))
+
+
+def _register_conversions():
+    node_versions = make_node_versions(10_000)
+    python_versions = NodeJSVersionSource.node_versions_to_python(node_versions)
+    # 1,000 distinct versions fit in the memo
+    warm_node_versions = node_versions[:1000] * 10
+    warm_python_versions = python_versions[:1000] * 10
+
+    def cold(convert, versions):
+        def run():
+            conversion_cache_clear()
+            convert(versions)
+
+        return run
+
+    def warm(convert, versions):
+        return lambda: convert(versions)
+
+    for direction, convert, versions, warm_versions in (
+        (
+            "node_to_python",
+            NodeJSVersionSource.node_versions_to_python,
+            node_versions,
+            warm_node_versions,
+        ),
+        (
+            "python_to_node",
+            NodeJSVersionSource.python_versions_to_node,
+            python_versions,
+            warm_python_versions,
+        ),
+    ):
+        benchmark(f"convert/{direction}/cold-10k")(
+            lambda workdir, c=convert, v=versions: cold(c, v)
+        )
+        benchmark(f"convert/{direction}/warm-10k")(
+            lambda workdir, c=convert, v=warm_versions: warm(c, v)
+        )
+
+
+def _register_package_reads():
+    # The stdlib backend is the reference; orjson is optional
+    backends = {"": "json"}
+    if importlib.util.find_spec("orjson") is not None:
+        backends["/orjson"] = "orjson"
+
+    for label, size in SIZES.items():
+        quick = label in QUICK_SIZES
+
+        for suffix, backend in backends.items():
+
+            @benchmark(f"load_package_data/{label}{suffix}", quick)
+            def load_package_data(workdir, size=size, backend=backend):
+                write_package(os.path.join(workdir, "package.json"), size=size)
+                hook = NodeJSMetadataHook(workdir, config={"json-backend": backend})
+
+                def run():
+                    package_json_cache.cache_clear()
+                    hook.load_package_data()
+
+                return run
+
+            @benchmark(f"get_version_data/{label}{suffix}", quick)
+            def get_version_data(workdir, size=size, backend=backend):
+                write_package(os.path.join(workdir, "package.json"), size=size)
+                source = NodeJSVersionSource(workdir, config={"json-backend": backend})
+
+                def run():
+                    clear_caches()
+                    source.get_version_data()
+
+                return run
+
+        @benchmark(f"set_version/{label}", quick, io=True)
+        def set_version(workdir, size=size):
+            write_package(os.path.join(workdir, "package.json"), size=size)
+            source = NodeJSVersionSource(workdir, config={})
+            versions = iter(("1.2.4", "1.2.3") * 10**6)
+
+            # Alternate between versions, so that every call writes
+            def run():
+                source.set_version(next(versions), {})
+
+            return run
+
+
+def _register_metadata():
+    # Only the metadata members are decoded, so these scale with the cost of
+    # skipping the rest of the document
+    for label, size in SIZES.items():
+
+        @benchmark(f"update/{label}", label in QUICK_SIZES)
+        def update_size(workdir, size=size):
+            write_package(os.path.join(workdir, "package.json"), size=size)
+            hook = NodeJSMetadataHook(workdir, config={"json-backend": "json"})
+
+            def run():
+                clear_caches()
+                hook.update({})
+
+            return run
+
+    for count in CONTRIBUTORS:
+
+        @benchmark(f"update/contributors-{count}", count in QUICK_CONTRIBUTORS)
+        def update(workdir, count=count):
+            write_package(os.path.join(workdir, "package.json"), contributors=count)
+            hook = NodeJSMetadataHook(workdir, config={})
+
+            def run():
+                clear_caches()
+                hook.update({})
+
+            return run
+
+
+_register_conversions()
+_register_package_reads()
+_register_metadata()
+
+
+def measure(func: Callable[[], object], repeat: int = 5) -> float:
+    """Return the best time per call of ``func``, in seconds."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run_benchmarks(quick: bool, selected: list[str] | None = None) -> dict:
+    calibration_time = measure(calibration)
+    results = {}
+    for name, (factory, is_quick, _) in BENCHMARKS.items():
+        if (quick and not is_quick) or (selected and name not in selected):
+            continue
+        with tempfile.TemporaryDirectory() as workdir:
+            seconds = measure(factory(workdir))
+        results[name] = {"seconds": seconds, "relative": seconds / calibration_time}
+        print(f"{name:45} {seconds * 1e3:12.3f} ms", file=sys.stderr)
+    clear_caches()
+    return {"calibration": calibration_time, "results": results}
+
+
+def compare(
+    current: dict,
+    baseline: dict,
+    tolerance: float,
+    io_tolerance: float | None = None,
+) -> list[str]:
+    """Return the names of benchmarks that regressed beyond ``tolerance``, or
+    ``io_tolerance`` for those bound by I/O. I/O-bound benchmarks are not gated
+    if ``io_tolerance`` is None.
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+        ratio = result["relative"] / baseline["results"][name]["relative"]
+        limit = (
+            io_tolerance if name in BENCHMARKS and BENCHMARKS[name][2] else tolerance
+        )
+        if limit is None:
+            status = "not gated"
+        elif ratio > limit:
+            status = "REGRESSED"
+            regressions.append(name)
+        else:
+            status = "ok"
+        print(f"{name:45} {ratio:8.2f}x baseline  {status}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="skip large inputs")
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument("--save", action="store_true", help="update the baseline")
+    action.add_argument("--compare", action="store_true", help="gate on the baseline")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=2.0,
+        help="slowdown factor beyond which a benchmark fails (default: 2.0)",
+    )
+    parser.add_argument(
+        "--io-tolerance",
+        type=float,
+        help="slowdown factor beyond which an I/O-bound benchmark fails "
+        "(default: not gated)",
+    )
+    parser.add_argument("--output", help="write the results as JSON to this path")
+    parser.add_argument("benchmarks", nargs="*", help="names of benchmarks to run")
+    args = parser.parse_args(argv)
+
+    current = run_benchmarks(args.quick, args.benchmarks)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+
+    if args.save:
+        baseline = {"calibration": None, "results": {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline["calibration"] = current["calibration"]
+        baseline["results"].update(current["results"])
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    if args.compare:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.tolerance, args.io_tolerance)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) regressed", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,331 @@
+# SPDX-FileCopyrightText: 2022-present Angus Hollands <goosey15@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""Differential fuzzing of the version converters against ``packaging``.
+
+    python benchmarks/fuzz_versions.py [--count N] [--seed S] [--max-latency MS]
+
+Valid, mutated and pathological Node.js and Python versions are generated, and
+every version that the converters accept is checked:
+
+- the Python form is a valid PEP 440 version, i.e. `packaging.version.Version`
+  accepts it;
+- converting the Python form to Node.js and back reproduces it exactly;
+- the normalised form of the version (as given by ``packaging``) is accepted,
+  and parsed to an equal `NodeJSVersion`.
+
+The conversion rate, and the slowest input, are reported. The process exits
+with a non-zero status if any check fails, or if any single conversion takes
+longer than ``--max-latency``.
+"""
+from __future__ import annotations
+
+import argparse
+import heapq
+import itertools
+import json
+import random
+import sys
+import time
+from typing import Iterator
+
+from packaging.version import InvalidVersion, Version
+
+from hatch_nodejs_version.version_source import (
+    NodeJSVersion,
+    _node_version_to_python,
+    _python_version_to_node,
+)
+
+LABELS = ("a", "b", "c", "rc", "alpha", "beta", "pre", "preview")
+NUMBERS = ("0", "1", "9", "10", "007", "2147483648", "123456789012345678901234567890")
+# The number of slowest inputs that are timed again
+SLOWEST = 10
+# Characters that are significant to the grammars, or that case-insensitive
+# matching treats specially
+MUTATIONS = (
+    *"0123456789.-_+!vV ",
+    "\t",
+    "\n",
+    "a",
+    "dev",
+    "post",
+    "rc",
+    "İ",  # LATIN CAPITAL LETTER I WITH DOT ABOVE
+    "ı",  # LATIN SMALL LETTER DOTLESS I
+    "ſ",  # LATIN SMALL LETTER LONG S
+    "K",  # KELVIN SIGN
+    "é",
+    "٣",  # ARABIC-INDIC DIGIT THREE
+)
+
+
+def _number(rng: random.Random) -> str:
+    if rng.random() < 0.1:
+        return rng.choice(NUMBERS)
+    return str(rng.randrange(1000))
+
+
+def _case(rng: random.Random, text: str) -> str:
+    kind = rng.random()
+    if kind < 0.05:
+        return text.upper()
+    if kind < 0.1:
+        return text.capitalize()
+    return text
+
+
+def _local(rng: random.Random) -> str:
+    alphabet = "abcxyz0123456789"
+    segments = [
+        "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4)))
+        for _ in range(rng.randint(1, 4))
+    ]
+    parts = [segments[0]]
+    for segment in segments[1:]:
+        parts.append(rng.choice("-_."))
+        parts.append(segment)
+    return _case(rng, "".join(parts))
+
+
+def _whitespace(rng: random.Random, version: str) -> str:
+    if rng.random() < 0.05:
+        return rng.choice(("", " ", "\t", "\n")) + version + rng.choice(("", " ", "\n"))
+    return version
+
+
+def node_version(rng: random.Random) -> str:
+    version = f"{_number(rng)}.{_number(rng)}.{_number(rng)}"
+    number = "" if rng.random() < 0.2 else _number(rng)
+
+    kind = rng.random()
+    if kind < 0.3:
+        label = _case(rng, rng.choice(LABELS))
+        version += f"-{label}{rng.choice(('', '.', '-'))}{number}"
+    elif kind < 0.4:
+        version += f"-{_case(rng, 'dev')}{rng.choice(('', '.', '-'))}{number}"
+    elif kind < 0.5:
+        label = _case(rng, rng.choice(LABELS))
+        version += f"-{label}{rng.choice(('', '.', '-'))}{number}"
+        version += f".{_case(rng, 'dev')}{rng.choice(('', '.', '-'))}{_number(rng)}"
+
+    if rng.random() < 0.2:
+        version += f"+{_local(rng)}"
+    return _whitespace(rng, version)
+
+
+def python_version(rng: random.Random) -> str:
+    version = f"{_number(rng)}.{_number(rng)}.{_number(rng)}"
+    if rng.random() < 0.05:
+        version = "v" + version
+
+    if rng.random() < 0.4:
+        label = _case(rng, rng.choice(LABELS))
+        number = "" if rng.random() < 0.2 else _number(rng)
+        version += f"{rng.choice(('', '.', '-', '_'))}{label}"
+        version += f"{rng.choice(('', '.', '-', '_'))}{number}"
+    if rng.random() < 0.2:
+        version += f"{rng.choice(('', '.', '-', '_'))}{_case(rng, 'dev')}{_number(rng)}"
+    if rng.random() < 0.2:
+        version += f"+{_local(rng)}"
+    return _whitespace(rng, version)
+
+
+def mutate(rng: random.Random, version: str) -> str:
+    for _ in range(rng.randint(1, 3)):
+        pos = rng.randint(0, len(version))
+        kind = rng.random()
+        if kind < 0.4:
+            version = version[:pos] + rng.choice(MUTATIONS) + version[pos:]
+        elif kind < 0.7:
+            version = version[:pos] + version[pos + 1 :]
+        elif kind < 0.9:
+            version = version[:pos] + rng.choice(MUTATIONS) + version[pos + 1 :]
+        else:
+            version = version[:pos]
+    return version
+
+
+def pathological(rng: random.Random) -> str:
+    size = rng.choice((100, 1000, 10000))
+    return rng.choice(
+        (
+            lambda: "1.2.3+" + "a." * size + "-",
+            lambda: "1.2.3+" + "a-" * size + ".",
+            lambda: "1.2.3+a" + "-" * size + "!",
+            lambda: "1." * size,
+            lambda: "1" * size + ".2.3",
+            lambda: " " * size + "1.2.3" + " " * size + "x",
+            lambda: "1.2.3-" + "a" * size,
+            lambda: "1.2.3" + "-a" * size,
+            lambda: "1.2.3-rc." + "dev" * size,
+        )
+    )()
+
+
+def generate(seed: int = 0) -> Iterator[tuple[str, str]]:
+    """Yield an endless stream of ``(kind, version)`` pairs, where ``kind`` is
+    ``node`` or ``python``.
+    """
+    rng = random.Random(seed)
+    while True:
+        kind = rng.choice(("node", "python"))
+        version = node_version(rng) if kind == "node" else python_version(rng)
+
+        roll = rng.random()
+        if roll < 0.3:
+            version = mutate(rng, version)
+        elif roll < 0.301:
+            version = pathological(rng)
+        yield kind, version
+
+
+def check_node(version: str, python: str) -> str | None:
+    """Check the conversion of the Node.js ``version`` to ``python``, returning
+    a description of the first failure.
+    """
+    try:
+        parsed = Version(python)
+    except InvalidVersion:
+        return f"invalid PEP 440 version {python!r}"
+
+    try:
+        round_trip = _node_version_to_python(_python_version_to_node(python))
+    except ValueError as error:
+        return f"{python!r} does not convert back to Node.js: {error}"
+    if round_trip != python:
+        return f"{python!r} round-trips to {round_trip!r}"
+
+    try:
+        normalised = NodeJSVersion.from_python(str(parsed))
+    except ValueError:
+        return f"normalised form {str(parsed)!r} is not accepted"
+    if normalised != NodeJSVersion.from_node(version):
+        return f"normalised form {str(parsed)!r} differs"
+    return None
+
+
+def check_python(version: str, node: str) -> str | None:
+    """Check the conversion of the Python ``version`` to ``node``, returning a
+    description of the first failure.
+    """
+    try:
+        parsed = Version(version)
+    except InvalidVersion:
+        return "accepted an invalid PEP 440 version"
+
+    try:
+        python = _node_version_to_python(node)
+    except ValueError as error:
+        return f"{node!r} does not convert back to Python: {error}"
+    if Version(python) != parsed:
+        return f"{node!r} converts back to {python!r}"
+    return check_node(node, python)
+
+
+def _time(convert, version: str) -> int:
+    start = time.perf_counter_ns()
+    try:
+        convert(version)
+    except ValueError:
+        pass
+    return time.perf_counter_ns() - start
+
+
+def fuzz(count: int, seed: int = 0) -> dict:
+    # Pathological inputs have numbers beyond the default limit of int(str)
+    if hasattr(sys, "set_int_max_str_digits"):
+        sys.set_int_max_str_digits(0)
+
+    converters = {"node": _node_version_to_python, "python": _python_version_to_node}
+    checks = {"node": check_node, "python": check_python}
+    accepted = {"node": 0, "python": 0}
+    failures: list[dict[str, str]] = []
+    slowest: list[tuple[int, int, str, str]] = []
+    elapsed = 0
+
+    for i, (kind, version) in enumerate(itertools.islice(generate(seed), count)):
+        convert = converters[kind]
+        start = time.perf_counter_ns()
+        try:
+            converted = convert(version)
+        except ValueError:
+            converted = None
+        duration = time.perf_counter_ns() - start
+        elapsed += duration
+
+        item = (duration, i, kind, version)
+        if len(slowest) < SLOWEST:
+            heapq.heappush(slowest, item)
+        elif duration > slowest[0][0]:
+            heapq.heapreplace(slowest, item)
+
+        if converted is None:
+            continue
+        accepted[kind] += 1
+        failure = checks[kind](version, converted)
+        if failure is not None:
+            failures.append({"kind": kind, "version": version, "failure": failure})
+
+    # A single timing can include a GC pause or a context switch, so the
+    # slowest inputs are timed again
+    worst = max(
+        (
+            (min(_time(converters[kind], version) for _ in range(5)), kind, version)
+            for _, _, kind, version in slowest
+        ),
+        default=(0, "", ""),
+    )
+    return {
+        "count": count,
+        "accepted": accepted,
+        "conversions_per_second": count / (elapsed / 1e9),
+        "worst_latency_ms": worst[0] / 1e6,
+        "worst_input": {"kind": worst[1], "version": worst[2][:100]},
+        "failures": failures,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--max-latency",
+        type=float,
+        default=10.0,
+        help="slowest permitted conversion, in milliseconds (default: 10)",
+    )
+    parser.add_argument("--output", help="write the report as JSON to this path")
+    args = parser.parse_args(argv)
+
+    report = fuzz(args.count, args.seed)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    print(
+        f"{report['count']} versions, {sum(report['accepted'].values())} accepted, "
+        f"{report['conversions_per_second']:,.0f} conversions/s",
+        file=sys.stderr,
+    )
+    print(
+        f"worst latency {report['worst_latency_ms']:.3f} ms for "
+        f"{report['worst_input']['kind']} {report['worst_input']['version']!r}",
+        file=sys.stderr,
+    )
+    for failure in report["failures"][:20]:
+        print(
+            f"FAILED {failure['kind']} {failure['version']!r}: {failure['failure']}",
+            file=sys.stderr,
+        )
+    if len(report["failures"]) > 20:
+        print(f"... and {len(report['failures']) - 20} more", file=sys.stderr)
+
+    if report["failures"] or report["worst_latency_ms"] > args.max_latency:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+# SPDX-FileCopyrightText: 2022-present Angus Hollands <goosey15@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""End-to-end benchmark of Hatchling's metadata core over synthetic monorepos.
+
+    python benchmarks/monorepo.py [--quick] [--projects N ...] [--output PATH]
+
+For each number of projects, an npm workspace is generated in a temporary
+directory, whose members each have a ``package.json`` and a ``pyproject.toml``
+that uses the ``nodejs`` version source and metadata hook. The metadata of
+every member is then resolved by Hatchling, as a build would, with the plugins
+discovered from their entry points; so the package must be installed, e.g.
+with ``pip install -e .``.
+
+Each number of projects is run in a fresh interpreter, so that its peak
+resident set size is not inflated by the others. The total and per-project
+times, and the peak RSS, are reported as JSON. The process exits with a
+non-zero status if any project resolves to the wrong metadata.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from _synthetic import make_node_versions, write_package
+
+PROJECTS = (10, 100, 500, 2000)
+QUICK_PROJECTS = (10, 100)
+DYNAMIC = (
+    "version",
+    "description",
+    "authors",
+    "maintainers",
+    "keywords",
+    "license",
+    "urls",
+)
+
+PYPROJECT_CONTENTS = """\
+[build-system]
+requires = ["hatchling", "hatch-nodejs-version"]
+build-backend = "hatchling.build"
+
+[project]
+name = "{name}"
+dynamic = [{dynamic}]
+
+[tool.hatch.version]
+source = "nodejs"
+
+[tool.hatch.metadata.hooks.nodejs]
+"""
+
+
+def generate_monorepo(
+    root: str, projects: int, size: int = 4096, seed: int = 0
+) -> list[tuple[str, str]]:
+    """Generate an npm workspace of ``projects`` members in ``root``, returning
+    the directory and Node.js version of each member.
+    """
+    with open(os.path.join(root, "package.json"), "w") as f:
+        json.dump(
+            {"name": "monorepo", "private": True, "workspaces": ["packages/*"]}, f
+        )
+
+    dynamic = ", ".join(f'"{field}"' for field in DYNAMIC)
+    members = []
+    for i, version in enumerate(make_node_versions(projects, seed)):
+        name = f"project-{i:05d}"
+        directory = os.path.join(root, "packages", name)
+        os.makedirs(directory)
+        write_package(
+            os.path.join(directory, "package.json"),
+            size=size,
+            contributors=5,
+            version=version,
+            name=name,
+            seed=seed + i,
+        )
+        with open(os.path.join(directory, "pyproject.toml"), "w") as f:
+            f.write(PYPROJECT_CONTENTS.format(name=name, dynamic=dynamic))
+        members.append((directory, version))
+    return members
+
+
+def peak_rss() -> int | None:
+    """Return the peak resident set size of this process in bytes, if known."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, but bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def resolve(members: list[tuple[str, str]]) -> dict:
+    """Resolve the core metadata of each of ``members`` through Hatchling,
+    returning the timings and any failures.
+    """
+    from hatchling.metadata.core import ProjectMetadata
+    from hatchling.metadata.spec import get_core_metadata_constructors
+    from hatchling.plugin.manager import PluginManager
+    from packaging.version import Version
+
+    from hatch_nodejs_version.version_source import _node_version_to_python
+
+    construct = get_core_metadata_constructors()["2.1"]
+    plugin_manager = PluginManager()
+    durations = []
+    failures = []
+    first = None
+
+    start = time.perf_counter()
+    for directory, version in members:
+        project_start = time.perf_counter()
+        try:
+            metadata = ProjectMetadata(directory, plugin_manager)
+            metadata.core
+            construct(metadata)
+        except Exception as error:
+            failures.append({"project": directory, "failure": repr(error)})
+            continue
+        durations.append(time.perf_counter() - project_start)
+        if first is None:
+            first = durations[-1]
+
+        # Hatchling normalises the version
+        expected = _node_version_to_python(version)
+        if Version(metadata.version) != Version(expected):
+            failure = f"resolved version {metadata.version!r}, not {expected!r}"
+            failures.append({"project": directory, "failure": failure})
+        elif not metadata.core.authors:
+            failures.append({"project": directory, "failure": "no authors resolved"})
+    total = time.perf_counter() - start
+
+    durations.sort()
+    return {
+        "projects": len(members),
+        "total_seconds": total,
+        "per_project_seconds": {
+            "mean": statistics.fmean(durations) if durations else None,
+            "p50": durations[len(durations) // 2] if durations else None,
+            "p95": durations[int(len(durations) * 0.95)] if durations else None,
+            "max": durations[-1] if durations else None,
+            # The first project also imports the plugins
+            "first": first,
+        },
+        "peak_rss_bytes": peak_rss(),
+        "failures": failures,
+    }
+
+
+def run(projects: int, size: int, seed: int) -> dict:
+    root = tempfile.mkdtemp(prefix="hatch-nodejs-monorepo-")
+    try:
+        members = generate_monorepo(root, projects, size, seed)
+        result = subprocess.run(
+            [sys.executable, __file__, "--child"],
+            input=json.dumps(members).encode(),
+            stdout=subprocess.PIPE,
+            check=True,
+        )
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return json.loads(result.stdout)
+
+
+def _child() -> int:
+    members = json.load(sys.stdin)
+    json.dump(resolve([tuple(member) for member in members]), sys.stdout)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="only run small monorepos")
+    parser.add_argument(
+        "--projects",
+        type=int,
+        nargs="+",
+        help=f"numbers of projects (default: {', '.join(map(str, PROJECTS))})",
+    )
+    parser.add_argument(
+        "--size",
+        type=int,
+        default=4096,
+        help="approximate size of each package.json in bytes (default: 4096)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the report as JSON to this path")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        return _child()
+
+    projects = args.projects or (QUICK_PROJECTS if args.quick else PROJECTS)
+    results = []
+    for count in projects:
+        result = run(count, args.size, args.seed)
+        results.append(result)
+        per_project = result["per_project_seconds"]
+        rss = result["peak_rss_bytes"]
+        print(
+            f"{count:>6} projects: {result['total_seconds']:8.3f} s total, "
+            f"{per_project['mean'] * 1e3:7.3f} ms/project "
+            f"(p95 {per_project['p95'] * 1e3:.3f} ms), "
+            f"peak RSS {'unknown' if rss is None else f'{rss / (1 << 20):.1f} MB'}",
+            file=sys.stderr,
+        )
+        for failure in result["failures"][:20]:
+            print(f"FAILED {failure['project']}: {failure['failure']}", file=sys.stderr)
+
+    report = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "package_size": args.size,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    return 1 if any(result["failures"] for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
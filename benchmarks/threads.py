@@ -0,0 +1,150 @@
+# SPDX-FileCopyrightText: 2022-present Angus Hollands <goosey15@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""Scaling of version and metadata throughput across threads.
+
+    python benchmarks/threads.py [--projects N] [--threads N ...] [--output PATH]
+
+Synthetic projects are resolved (their version read by `NodeJSVersionSource`,
+and their metadata by `NodeJSMetadataHook`) on a pool of 1 to N threads of
+one process. Each thread count is timed twice: ``cold``, with the caches
+emptied first, and ``warm``, with every ``package.json`` already cached, which
+measures contention for the shared caches alone.
+
+Throughput only scales with threads on a free-threaded build of CPython (e.g.
+3.13t); the report records whether the GIL was enabled.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from _synthetic import make_node_versions, write_package
+
+from hatch_nodejs_version._person import person_cache_clear
+from hatch_nodejs_version.cache import package_json_cache
+from hatch_nodejs_version.metadata_source import NodeJSMetadataHook
+from hatch_nodejs_version.version_source import (
+    NodeJSVersionSource,
+    conversion_cache_clear,
+)
+
+
+def clear_caches():
+    package_json_cache.cache_clear()
+    conversion_cache_clear()
+    person_cache_clear()
+
+
+def resolve(directories: list[str]):
+    for directory in directories:
+        NodeJSVersionSource(directory, config={}).get_version_data()
+        NodeJSMetadataHook(directory, config={}).update({})
+
+
+def measure(directories: list[str], threads: int, repeat: int, warm: bool) -> float:
+    """Return the best time taken to resolve ``directories`` on ``threads``
+    threads.
+    """
+    chunks = [directories[i::threads] for i in range(threads)]
+    best = float("inf")
+    with ThreadPoolExecutor(threads) as executor:
+        for _ in range(repeat):
+            clear_caches()
+            if warm:
+                resolve(directories)
+            start = time.perf_counter()
+            list(executor.map(resolve, chunks))
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    cpus = os.cpu_count() or 1
+    default_threads = sorted({1, *(2**i for i in range(1, 8) if 2**i <= cpus), cpus})
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=1000)
+    parser.add_argument(
+        "--threads",
+        type=int,
+        nargs="+",
+        default=default_threads,
+        help="numbers of threads (default: powers of two up to the CPU count)",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--size",
+        type=int,
+        default=4096,
+        help="approximate size of each package.json in bytes (default: 4096)",
+    )
+    parser.add_argument("--output", help="write the report as JSON to this path")
+    args = parser.parse_args(argv)
+
+    root = tempfile.mkdtemp(prefix="hatch-nodejs-threads-")
+    try:
+        directories = []
+        for i, version in enumerate(make_node_versions(args.projects)):
+            directory = os.path.join(root, f"project-{i:05d}")
+            os.mkdir(directory)
+            write_package(
+                os.path.join(directory, "package.json"),
+                size=args.size,
+                contributors=20,
+                version=version,
+                name=f"project-{i:05d}",
+                seed=i,
+            )
+            directories.append(directory)
+
+        results = []
+        for mode in ("cold", "warm"):
+            # Speedups are relative to the first (i.e. fewest) number of threads
+            single = None
+            for threads in args.threads:
+                elapsed = measure(directories, threads, args.repeat, mode == "warm")
+                throughput = args.projects / elapsed
+                if single is None:
+                    single = throughput
+                results.append(
+                    {
+                        "mode": mode,
+                        "threads": threads,
+                        "seconds": elapsed,
+                        "projects_per_second": throughput,
+                        "speedup": throughput / single,
+                    }
+                )
+                print(
+                    f"{mode:<5} {threads:>3} threads: {throughput:10,.0f} projects/s "
+                    f"({throughput / single:.2f}x)",
+                    file=sys.stderr,
+                )
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    report = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "gil_enabled": getattr(sys, "_is_gil_enabled", lambda: True)(),
+        "cpus": cpus,
+        "projects": args.projects,
+        "package_size": args.size,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
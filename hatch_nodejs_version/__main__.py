@@ -0,0 +1,160 @@
+# SPDX-FileCopyrightText: 2022-present Angus Hollands <goosey15@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""Convert versions between Node.js and Python, one per line.
+
+    python -m hatch_nodejs_version [--to-python | --to-node] [-0 | --jsonl] [FILE ...]
+
+Versions are read from each ``FILE`` (or standard input, given as ``-``) and
+converted as they are read, so memory use does not grow with the input.
+Invalid versions are reported to standard error, and the exit status is 1 if
+there were any.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import BinaryIO, Iterator
+
+from .version_source import _node_version_to_python, _python_version_to_node
+
+CHUNK_SIZE = 1 << 16
+# Streams are mostly distinct versions, for which the shared LRU memo of the
+# version source costs more than it saves; a dict that is emptied when full
+# still absorbs repeats, in constant memory
+MEMO_SIZE = 1 << 16
+
+
+def _records(f: BinaryIO, separator: bytes) -> Iterator[bytes]:
+    if separator == b"\n":
+        for line in f:
+            yield line.rstrip(b"\r\n")
+        return
+
+    pending = b""
+    while True:
+        chunk = f.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        *records, pending = (pending + chunk).split(separator)
+        yield from records
+    if pending:
+        yield pending
+
+
+def convert_stream(
+    f: BinaryIO,
+    out: BinaryIO,
+    err,
+    *,
+    to_node: bool = False,
+    separator: bytes = b"\n",
+    jsonl: bool = False,
+    name: str = "<stdin>",
+) -> int:
+    """Convert the versions in ``f``, writing them to ``out`` and reporting
+    invalid versions to ``err``. Return the number of invalid versions.
+    """
+    convert = _python_version_to_node if to_node else _node_version_to_python
+    keys = ("python", "node") if to_node else ("node", "python")
+    write = out.write
+    memo: dict[str, str] = {}
+
+    invalid = 0
+    for number, record in enumerate(_records(f, separator), 1):
+        if not record:
+            continue
+        try:
+            version = record.decode("utf-8")
+            converted = memo.get(version)
+            if converted is None:
+                converted = convert(version)
+                if len(memo) >= MEMO_SIZE:
+                    memo.clear()
+                memo[version] = converted
+        except ValueError as error:
+            invalid += 1
+            print(f"{name}:{number}: {error}", file=err)
+            continue
+
+        if jsonl:
+            line = json.dumps({keys[0]: version, keys[1]: converted})
+            write(line.encode("utf-8") + b"\n")
+        else:
+            write(converted.encode("utf-8") + separator)
+    return invalid
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m hatch_nodejs_version",
+        description="Convert versions between Node.js and Python, one per line.",
+    )
+    direction = parser.add_mutually_exclusive_group()
+    direction.add_argument(
+        "--to-python",
+        dest="to_node",
+        action="store_false",
+        help="convert Node.js versions to Python versions (the default)",
+    )
+    direction.add_argument(
+        "--to-node",
+        dest="to_node",
+        action="store_true",
+        help="convert Python versions to Node.js versions",
+    )
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument(
+        "-0",
+        "--null",
+        action="store_true",
+        help="read and write NUL-separated versions",
+    )
+    output.add_argument(
+        "--jsonl",
+        action="store_true",
+        help="write a JSON object of both forms of each version per line",
+    )
+    parser.add_argument(
+        "files", nargs="*", default=["-"], help="files to read (default: stdin)"
+    )
+    parser.set_defaults(to_node=False)
+    args = parser.parse_args(argv)
+
+    separator = b"\0" if args.null else b"\n"
+    out = sys.stdout.buffer
+    invalid = 0
+    for path in args.files:
+        try:
+            if path == "-":
+                invalid += convert_stream(
+                    sys.stdin.buffer,
+                    out,
+                    sys.stderr,
+                    to_node=args.to_node,
+                    separator=separator,
+                    jsonl=args.jsonl,
+                )
+            else:
+                with open(path, "rb") as f:
+                    invalid += convert_stream(
+                        f,
+                        out,
+                        sys.stderr,
+                        to_node=args.to_node,
+                        separator=separator,
+                        jsonl=args.jsonl,
+                        name=path,
+                    )
+        except BrokenPipeError:
+            # The reader has gone away, e.g. `head`
+            return 1
+        except OSError as error:
+            parser.exit(2, f"{parser.prog}: error: {error}\n")
+    out.flush()
+    return 1 if invalid else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+# SPDX-FileCopyrightText: 2022-present Angus Hollands <goosey15@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""Support for the ``async`` counterparts of the plugin methods.
+
+The blocking operations are run on the default executor of the running loop,
+so that file I/O never stalls it. At most `MAX_CONCURRENCY` operations per
+loop run at once; the rest wait on a semaphore rather than queueing in the
+executor, where they would starve other users of it.
+"""
+from __future__ import annotations
+
+import asyncio
+import weakref
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+MAX_CONCURRENCY = 32
+
+_semaphores: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _semaphore() -> asyncio.Semaphore:
+    # Semaphores are bound to the loop on which they are first used
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(MAX_CONCURRENCY)
+    return semaphore
+
+
+async def run_blocking(func: Callable[..., T], *args: Any) -> T:
+    """Call ``func(*args)`` in a worker thread, with the current context."""
+    async with _semaphore():
+        return await asyncio.to_thread(func, *args)
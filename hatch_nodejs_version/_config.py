@@ -0,0 +1,265 @@
+# SPDX-FileCopyrightText: 2022-present Angus Hollands <goosey15@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""Validated, immutable snapshots of the plugin options.
+
+Hatch creates plugin instances per target and per environment, mostly with
+equal configurations. The options of a configuration are validated together,
+when first used, and every invalid option is reported by a single
+`ConfigurationError`. Snapshots are memoized on the contents of the
+configuration, so that later instances re-use them without validating again.
+"""
+from __future__ import annotations
+
+import os
+from typing import Any, Hashable
+
+from ._json import BACKENDS
+from ._scan import parse_pointer
+from .cache import LRUCache
+
+# Seconds that `set_version` waits for other writers by default
+LOCK_TIMEOUT = 60.0
+
+SNAPSHOT_CACHE_SIZE = 256
+_snapshots = LRUCache(SNAPSHOT_CACHE_SIZE)
+
+
+class ConfigurationError(TypeError, ValueError):
+    """One or more plugin options are invalid.
+
+    ``errors`` holds an exception per problem, which is either a `TypeError`
+    (an option of the wrong type) or a `ValueError` (an option of the right
+    type, but with an unsupported value).
+    """
+
+    def __init__(self, errors: list[Exception]):
+        super().__init__("\n".join(str(error) for error in errors))
+        self.errors = errors
+
+
+class _Problems:
+    """Collects the problems with the options of a configuration."""
+
+    def __init__(self, kind: str, plugin_name: str):
+        self.kind = kind
+        self.plugin_name = plugin_name
+        self.errors: list[Exception] = []
+
+    def add(self, error: Exception):
+        self.errors.append(error)
+
+    def option(self, error_type: type[Exception], option: str, requirement: str):
+        self.add(
+            error_type(
+                f"Option `{option}` for {self.kind} `{self.plugin_name}` {requirement}"
+            )
+        )
+
+
+def _freeze(value: Any) -> Hashable:
+    # Scalars other than strings are tagged with their type, as e.g. `True == 1`
+    kind = type(value)
+    if kind is str:
+        return value
+    if kind is dict:
+        return dict, frozenset([(key, _freeze(item)) for key, item in value.items()])
+    if kind is list:
+        return list, tuple([_freeze(item) for item in value])
+    hash(value)
+    return kind, value
+
+
+class _Options:
+    """Base of the option snapshots, whose attributes are set once."""
+
+    __slots__ = ()
+    KIND = ""
+
+    def __init__(self, **options: Any):
+        for name, value in options.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __repr__(self):
+        options = ", ".join(
+            f"{name}={getattr(self, name)!r}" for name in self.__slots__
+        )
+        return f"{type(self).__name__}({options})"
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any], plugin_name: str):
+        """Return the validated options of ``config``, re-using the snapshot of
+        an equal configuration.
+        """
+        try:
+            key = (cls, plugin_name, _freeze(config))
+        except TypeError:
+            # Values that TOML cannot express, e.g. sets, are validated afresh
+            return cls._validate(config, plugin_name)
+        return _snapshots.get_or_compute(
+            key, lambda key: cls._validate(config, plugin_name)
+        )
+
+    @classmethod
+    def _validate(cls, config: dict[str, Any], plugin_name: str):
+        problems = _Problems(cls.KIND, plugin_name)
+        options = cls._check(config, problems)
+        if problems.errors:
+            raise ConfigurationError(problems.errors)
+        return cls(**options)
+
+    @staticmethod
+    def _check_string(
+        config: dict[str, Any], problems: _Problems, option: str, default: str | None
+    ) -> Any:
+        # Options are optional if they have no default
+        value = config.get(option, default)
+        if not (isinstance(value, str) or (value is None and default is None)):
+            problems.option(TypeError, option, "must be a string")
+        return value
+
+    @staticmethod
+    def _check_bool(
+        config: dict[str, Any], problems: _Problems, option: str, default: bool
+    ) -> Any:
+        value = config.get(option, default)
+        if not isinstance(value, bool):
+            problems.option(TypeError, option, "must be a boolean")
+        return value
+
+    @classmethod
+    def _check_json_backend(cls, config: dict[str, Any], problems: _Problems) -> Any:
+        value = cls._check_string(config, problems, "json-backend", None)
+        if isinstance(value, str) and value not in BACKENDS:
+            problems.option(
+                ValueError, "json-backend", f"must be one of {', '.join(BACKENDS)}"
+            )
+        return value
+
+
+class VersionSourceOptions(_Options):
+    """The options of `NodeJSVersionSource`."""
+
+    __slots__ = (
+        "path",
+        "targets",
+        "cache_dir",
+        "trace_file",
+        "json_backend",
+        "lock_timeout",
+    )
+    KIND = "version source"
+
+    @classmethod
+    def _check(cls, config: dict[str, Any], problems: _Problems) -> dict[str, Any]:
+        path = config.get("path", "package.json")
+        if isinstance(path, (str, bytes, os.PathLike)):
+            path = os.fspath(path)
+        else:
+            problems.option(TypeError, "path", "must be a string")
+
+        targets = config.get("targets", [])
+        # The `(path, pointer)` of each member that is written
+        result = {}
+        if isinstance(path, (str, bytes)):
+            result[os.path.normpath(path), "/version"] = None
+        if not isinstance(targets, list):
+            problems.option(TypeError, "targets", "must be a list")
+            targets = []
+        for target in targets:
+            if isinstance(target, str):
+                target = {"path": target}
+            if not (
+                isinstance(target, dict)
+                and isinstance(target.get("path"), str)
+                and isinstance(target.get("pointer", ""), str)
+                and target.keys() <= {"path", "pointer"}
+            ):
+                problems.option(
+                    TypeError,
+                    "targets",
+                    "must contain strings, or tables with a string `path` and an "
+                    "optional string `pointer`",
+                )
+                continue
+
+            pointer = target.get("pointer", "/version")
+            try:
+                parse_pointer(pointer)
+            except ValueError as e:
+                problems.add(e)
+                continue
+            result[os.path.normpath(target["path"]), pointer] = None
+
+        lock_timeout = config.get("lock-timeout", LOCK_TIMEOUT)
+        if isinstance(lock_timeout, bool) or not isinstance(lock_timeout, (int, float)):
+            problems.option(TypeError, "lock-timeout", "must be a number")
+        elif lock_timeout < 0:
+            problems.option(ValueError, "lock-timeout", "must not be negative")
+
+        return {
+            "path": path,
+            "targets": tuple(result),
+            "cache_dir": cls._check_string(config, problems, "cache-dir", None),
+            "trace_file": cls._check_string(config, problems, "trace-file", None),
+            "json_backend": cls._check_json_backend(config, problems),
+            "lock_timeout": lock_timeout,
+        }
+
+
+class MetadataHookOptions(_Options):
+    """The options of `NodeJSMetadataHook`."""
+
+    __slots__ = (
+        "path",
+        "fields",
+        "contributors_as_maintainers",
+        "homepage_label",
+        "bugs_label",
+        "repository_label",
+        "cache_dir",
+        "trace_file",
+        "json_backend",
+        "inherit",
+    )
+    KIND = "metadata hook"
+
+    @classmethod
+    def _check(cls, config: dict[str, Any], problems: _Problems) -> dict[str, Any]:
+        path = config.get("path", "package.json")
+        if not isinstance(path, str):
+            problems.option(TypeError, "path", "must be a string")
+
+        fields = config.get("fields", None)
+        if fields is not None:
+            if isinstance(fields, list) and all(isinstance(f, str) for f in fields):
+                fields = frozenset(fields)
+            else:
+                problems.option(TypeError, "fields", "must be a list of strings")
+
+        return {
+            "path": path,
+            "fields": fields,
+            "contributors_as_maintainers": cls._check_bool(
+                config, problems, "contributors-as-maintainers", True
+            ),
+            "homepage_label": cls._check_string(
+                config, problems, "homepage-label", "Homepage"
+            ),
+            "bugs_label": cls._check_string(
+                config, problems, "bugs-label", "Bug Tracker"
+            ),
+            "repository_label": cls._check_string(
+                config, problems, "repository-label", "Repository"
+            ),
+            "cache_dir": cls._check_string(config, problems, "cache-dir", None),
+            "trace_file": cls._check_string(config, problems, "trace-file", None),
+            "json_backend": cls._check_json_backend(config, problems),
+            "inherit": cls._check_bool(config, problems, "inherit", False),
+        }
@@ -0,0 +1,97 @@
+# SPDX-FileCopyrightText: 2022-present Angus Hollands <goosey15@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""Persistent cache of values derived from ``package.json``.
+
+PEP 517 frontends run each build hook in a fresh subprocess. This cache lets
+those subprocesses (and later builds) re-use the version and metadata derived
+by an earlier one. Entries are keyed by a hash of the ``package.json`` contents
+and the plugin configuration, so they never need to be invalidated; old
+entries are evicted once the cache holds more than `MAX_ENTRIES`.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from typing import Any
+
+from ._io import atomic_write
+from ._version import __version__
+
+MAX_ENTRIES = 64
+
+# Entries are named distinctively, so that eviction leaves any other files in
+# the directory alone
+_ENTRY_NAME = re.compile(r"nodejs-[0-9a-f]{64}\.json")
+
+
+class DiskCache:
+    def __init__(self, directory: str, max_entries: int = MAX_ENTRIES):
+        self.directory = directory
+        self.max_entries = max_entries
+
+    @staticmethod
+    def key(kind: str, content: bytes, config: dict[str, Any]) -> str:
+        digest = hashlib.sha256()
+        header = json.dumps([__version__, kind, config], sort_keys=True, default=str)
+        digest.update(header.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(content)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"nodejs-{key}.json")
+
+    def load(self, key: str) -> Any:
+        """Return the value stored under ``key``, or `None` if there is no
+        (readable) entry.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = json.loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+        # Mark the entry as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def store(self, key: str, value: Any):
+        """Store ``value`` under ``key``. Failures to write are ignored, as the
+        cache is only an optimisation.
+        """
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Concurrent writers of a key write identical contents, and the
+            # rename means that readers never see a partial entry
+            atomic_write(self._path(key), json.dumps(value).encode("utf-8"))
+        except OSError:
+            return
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if _ENTRY_NAME.fullmatch(entry.name):
+                        try:
+                            entries.append((entry.stat().st_mtime_ns, entry.path))
+                        except OSError:
+                            pass
+        except OSError:
+            return
+
+        entries.sort()
+        for _, path in entries[: max(0, len(entries) - self.max_entries)]:
+            try:
+                os.unlink(path)
+            except OSError:
+                # Probably evicted by another process
+                pass
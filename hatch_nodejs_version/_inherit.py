@@ -0,0 +1,86 @@
+# SPDX-FileCopyrightText: 2022-present Angus Hollands <goosey15@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""Inheritance of ``package.json`` members from the enclosing npm workspace.
+
+Workspace members commonly leave fields such as ``repository`` to the root
+``package.json``. Those fields are looked up in the ``package.json`` of each
+parent directory, nearest first, up to the workspace root (the first that
+declares ``workspaces``). Files outside of a workspace inherit nothing.
+
+The parent directories that contain a ``package.json`` are memoized for the
+life of the process, and the ancestors themselves are loaded through the
+stat-keyed `package_json_cache`, so that the siblings of a workspace share a
+single read of each common ancestor.
+"""
+from __future__ import annotations
+
+import os
+from typing import Any, Collection
+
+from .cache import LRUCache, package_json_cache
+
+INHERITED_KEYS = frozenset(("author", "bugs", "homepage", "license", "repository"))
+# Members of package.json that are loaded from each ancestor
+_ANCESTOR_KEYS = INHERITED_KEYS | {"workspaces"}
+
+DIRECTORY_CACHE_SIZE = 4096
+_parent_cache = LRUCache(DIRECTORY_CACHE_SIZE)
+
+
+def inherit_cache_clear():
+    _parent_cache.cache_clear()
+
+
+def _find_parent_package(directory: str) -> str | None:
+    parent = os.path.dirname(directory)
+    if parent == directory:
+        return None
+    if os.path.isfile(os.path.join(parent, "package.json")):
+        return parent
+    return _parent_cache.get_or_compute(parent, _find_parent_package)
+
+
+def parent_package(directory: str) -> str | None:
+    """Return the nearest proper ancestor of ``directory`` that contains a
+    ``package.json``, or `None` if there is none.
+    """
+    return _parent_cache.get_or_compute(directory, _find_parent_package)
+
+
+def load_inherited(
+    path: str, keys: Collection[str], backend: str | None = None
+) -> dict[str, Any]:
+    """Return the members named by ``keys`` that the ``package.json`` at the
+    resolved ``path`` inherits from its ancestors in the workspace, decoded by
+    the JSON ``backend``.
+    """
+    keys = INHERITED_KEYS.intersection(keys)
+    if not keys:
+        return {}
+
+    inherited: dict[str, Any] = {}
+    directory = parent_package(os.path.dirname(path))
+    while directory is not None:
+        package = package_json_cache.load_members(
+            directory, "package.json", _ANCESTOR_KEYS, backend
+        )
+        if isinstance(package, dict):
+            for key in keys:
+                if key in package:
+                    inherited.setdefault(key, package[key])
+            if "workspaces" in package:
+                return inherited
+        directory = parent_package(directory)
+
+    # Not within a workspace
+    return {}
+
+
+def merge_inherited(package: Any, inherited: dict[str, Any]) -> Any:
+    """Return ``package`` with the ``inherited`` members that it lacks. The
+    workspace root itself inherits nothing.
+    """
+    if not (inherited and isinstance(package, dict)) or "workspaces" in package:
+        return package
+    return {**inherited, **package}
@@ -0,0 +1,196 @@
+# SPDX-FileCopyrightText: 2022-present Angus Hollands <goosey15@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import contextlib
+import os
+import stat
+import time
+from typing import Iterable, Iterator, Sequence
+
+# On Windows, where directories cannot be locked, the lock is taken on a file
+# of this name within the directory, which is removed once it is unused
+LOCK_FILE_NAME = ".hatch-nodejs-version.lock"
+
+
+def read_file(root: str, path: str) -> bytes:
+    """Read the file at ``path`` relative to ``root``."""
+    full_path = os.path.normpath(os.path.join(root, path))
+    if not os.path.isfile(full_path):
+        raise OSError(f"file does not exist: {path}")
+
+    with open(full_path, "rb") as f:
+        return f.read()
+
+
+def _unlink(path: str):
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _stage(path: str, data: bytes) -> str:
+    """Write ``data`` to a temporary file alongside ``path``, with the
+    permissions of ``path`` (if it exists), returning the temporary path.
+    """
+    # `tempfile` is costly to import, and is only needed when writing
+    import tempfile
+
+    directory, name = os.path.split(path)
+    fd, temp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            pass
+        else:
+            os.chmod(temp_path, mode)
+    except BaseException:
+        _unlink(temp_path)
+        raise
+    return temp_path
+
+
+def _sync_directory(directory: str):
+    # Persist renames within the directory; not possible on Windows
+    try:
+        fd = os.open(directory or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write(path: str, data: bytes):
+    """Replace the contents of ``path`` with ``data``.
+
+    The data are written to a temporary file in the same directory, which is
+    then renamed over ``path``, so readers never observe a partial write. The
+    permissions of an existing file are preserved.
+    """
+    temp_path = _stage(path, data)
+    try:
+        os.replace(temp_path, path)
+    except BaseException:
+        _unlink(temp_path)
+        raise
+
+
+def atomic_write_many(writes: Sequence[tuple[str, bytes, bytes]]):
+    """Replace the contents of several files at once, given as ``(path, data,
+    original)`` triples, where ``original`` is the current contents of ``path``.
+
+    Every file is staged (and synced) before any is replaced, then each is
+    replaced as by `atomic_write`, and their directories are synced once. If
+    any step fails, the files that were already replaced are restored to their
+    original contents, and the error is raised.
+    """
+    staged: list[tuple[str, str, bytes]] = []
+    replaced: list[tuple[str, bytes]] = []
+    try:
+        for path, data, original in writes:
+            staged.append((path, _stage(path, data), original))
+
+        for path, temp_path, original in staged:
+            os.replace(temp_path, path)
+            replaced.append((path, original))
+    except BaseException:
+        for _, temp_path, _ in staged:
+            _unlink(temp_path)
+        for path, original in reversed(replaced):
+            atomic_write(path, original)
+        raise
+
+    for directory in dict.fromkeys(os.path.dirname(path) for path, _ in replaced):
+        _sync_directory(directory)
+
+
+@contextlib.contextmanager
+def _lock_directory(directory: str, deadline: float | None) -> Iterator[None]:
+    lock_path = None
+    if os.name == "nt":
+        import msvcrt
+
+        lock_path = os.path.join(directory, LOCK_FILE_NAME)
+        fd = os.open(lock_path, os.O_RDWR | os.O_CREAT)
+
+        def acquire() -> bool:
+            try:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            except OSError:
+                return False
+            return True
+
+        def release():
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+    else:
+        import fcntl
+
+        fd = os.open(directory or ".", os.O_RDONLY)
+
+        def acquire() -> bool:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return False
+            return True
+
+        def release():
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+    try:
+        delay = 0.001
+        while not acquire():
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(
+                        f"Timed out waiting for the lock on {directory or '.'}"
+                    )
+                delay = min(delay, remaining)
+            time.sleep(delay)
+            delay = min(delay * 2, 0.1)
+
+        try:
+            yield
+        finally:
+            release()
+    finally:
+        os.close(fd)
+        if lock_path is not None:
+            # Windows refuses to delete a file that another process has open,
+            # so this fails (harmlessly) whilst another writer waits on it
+            _unlink(lock_path)
+
+
+@contextlib.contextmanager
+def lock_directories(
+    directories: Iterable[str], timeout: float | None = None
+) -> Iterator[None]:
+    """Hold an exclusive advisory lock on each of ``directories``.
+
+    The locks are taken with ``flock`` on each directory itself (or on Windows,
+    on a `LOCK_FILE_NAME` file within it, which is removed afterwards unless
+    another process has it open), in sorted order so that callers with
+    overlapping directories cannot deadlock. They exclude other processes, and
+    threads, that lock the same directories. `TimeoutError` is raised if the
+    locks are not all held within ``timeout`` seconds.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    with contextlib.ExitStack() as stack:
+        for directory in sorted(set(directories)):
+            stack.enter_context(_lock_directory(directory, deadline))
+        yield
@@ -0,0 +1,95 @@
+# SPDX-FileCopyrightText: 2022-present Angus Hollands <goosey15@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""Backends for decoding JSON documents from raw bytes.
+
+The ``orjson`` backend uses `orjson <https://github.com/ijl/orjson>`_, which
+parses large documents several times faster than the standard library, and
+decodes UTF-8 without an intermediate copy. Where orjson would disagree with
+the standard library (e.g. on ``NaN``, lone surrogates, or integers beyond 64
+bits), the document is decoded by the standard library instead, so that both
+backends give the same results and raise the same errors.
+
+The backend is chosen by the ``json-backend`` option of either plugin, or else
+by the `JSON_BACKEND_ENV_VAR` environment variable. The default, ``auto``,
+uses orjson if it is installed.
+"""
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Callable
+
+JSON_BACKEND_ENV_VAR = "HATCH_NODEJS_VERSION_JSON"
+BACKENDS = ("auto", "json", "orjson")
+
+# orjson decodes integers beyond 64 bits as floats, so documents with long runs
+# of digits are left to the standard library. Searching a translation, in which
+# every digit is "0", is much faster than searching with a regex
+_DIGITS = bytes.maketrans(b"123456789", b"000000000")
+_orjson: Any = None
+
+
+def copy_json(value: Any) -> Any:
+    """Return a deep copy of the decoded JSON ``value``, which is several times
+    faster than `copy.deepcopy` for documents of only dicts, lists and scalars.
+    """
+    kind = type(value)
+    if kind is dict:
+        return {key: copy_json(item) for key, item in value.items()}
+    if kind is list:
+        return [copy_json(item) for item in value]
+    return value
+
+
+def loads_json(data) -> Any:
+    """Decode the UTF-8 JSON document ``data`` with the standard library."""
+    # Slicing copies a memory map, but not bytes
+    return json.loads(data[:].decode("utf-8"))
+
+
+def loads_orjson(data) -> Any:
+    """Decode the UTF-8 JSON document ``data`` with orjson, falling back to the
+    standard library where the two disagree.
+    """
+    # Slicing copies a memory map into bytes
+    data = data[:]
+    if b"0" * 19 not in data.translate(_DIGITS):
+        try:
+            return _orjson.loads(data)
+        except _orjson.JSONDecodeError:
+            # Either invalid, or valid only to the standard library
+            pass
+    return loads_json(data)
+
+
+def _import_orjson() -> bool:
+    global _orjson
+
+    if _orjson is None:
+        try:
+            import orjson
+        except ImportError:
+            return False
+        _orjson = orjson
+    return True
+
+
+def get_loads(backend: str | None = None) -> Callable[[Any], Any]:
+    """Return the ``loads`` function of ``backend``, defaulting to the backend
+    named by the environment.
+    """
+    if backend is None:
+        backend = os.environ.get(JSON_BACKEND_ENV_VAR) or "auto"
+
+    if backend == "json":
+        return loads_json
+    elif backend == "orjson":
+        if not _import_orjson():
+            raise ImportError("JSON backend `orjson` requires the orjson package")
+        return loads_orjson
+    elif backend == "auto":
+        return loads_orjson if _import_orjson() else loads_json
+    raise ValueError(
+        f"Unknown JSON backend {backend!r}, expected one of {', '.join(BACKENDS)}"
+    )
@@ -0,0 +1,120 @@
+# SPDX-FileCopyrightText: 2022-present Angus Hollands <goosey15@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""Parsing of npm "people" fields, e.g. ``Barney Rubble <b@rubble.com> (http://b.com)``.
+
+`parse_person_string` is equivalent to matching `metadata_source.AUTHOR_PATTERN`,
+but makes a single pass over the string, so that it runs in linear time even on
+long malformed inputs.
+"""
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+from .cache import LRUCache
+
+
+class Person:
+    __slots__ = ("name", "email")
+
+    def __init__(self, name: str | None, email: str | None = None):
+        self.name = name
+        self.email = email
+
+    def __eq__(self, other):
+        if not isinstance(other, Person):
+            return NotImplemented
+        return self.name == other.name and self.email == other.email
+
+    def __hash__(self):
+        return hash((self.name, self.email))
+
+    def __repr__(self):
+        return f"{type(self).__name__}(name={self.name!r}, email={self.email!r})"
+
+    def as_dict(self) -> dict[str, str]:
+        if self.email is None:
+            return {"name": self.name}
+        return {"name": self.name, "email": self.email}
+
+
+def _is_end(person: str, pos: int) -> bool:
+    # Equivalent to `$`, which also matches before a trailing newline
+    return pos == len(person) or (pos == len(person) - 1 and person[pos] == "\n")
+
+
+def _parse_person_string(person: str) -> Person:
+    if not isinstance(person, str):
+        raise TypeError(f"Invalid author name: {person!r}")
+
+    size = len(person)
+    # The name runs up to the first bracket
+    bracket = min(
+        (i for i in (person.find("<"), person.find("(")) if i >= 0), default=size
+    )
+
+    email = None
+    if bracket == size:
+        end = size - 1 if person.endswith("\n") else size
+    else:
+        end = pos = bracket
+        if person[pos] == "<":
+            close = person.find(">", pos + 1)
+            if close <= pos + 1 or person.find("(", pos + 1, close) >= 0:
+                raise ValueError(f"Invalid author name: {person}")
+            email = person[pos + 1 : close]
+            pos = close + 1
+
+        while pos < size and person[pos] in " \t":
+            pos += 1
+
+        if not _is_end(person, pos):
+            if person[pos] != "(" or person.find(")", pos + 1) <= pos + 1:
+                raise ValueError(f"Invalid author name: {person}")
+
+    # The name excludes trailing blanks, but is never empty if there is a prefix
+    name_end = len(person[:end].rstrip(" \t"))
+    if name_end:
+        name = person[:name_end]
+    elif person and (end or bracket == size):
+        name = person[:1]
+    else:
+        name = None
+    return Person(name, email)
+
+
+PERSON_CACHE_SIZE = 4096
+_person_cache = LRUCache(PERSON_CACHE_SIZE)
+
+
+def person_cache_clear():
+    _person_cache.cache_clear()
+
+
+def parse_person_string(person: str) -> Person:
+    """Parse a ``Name <email> (url)`` string, memoizing repeated strings."""
+    return _person_cache.get_or_compute(person, _parse_person_string)
+
+
+def parse_person(person: str | dict[str, Any]) -> Person:
+    """Parse an npm person, given either as a string or as an object."""
+    if isinstance(person, dict):
+        if {"url", "email"} & person.keys():
+            return Person(person["name"], person.get("email"))
+        person = person["name"]
+    if isinstance(person, str):
+        return parse_person_string(person)
+    return _parse_person_string(person)
+
+
+def parse_people(people: Iterable[str | dict[str, Any]]) -> list[Person]:
+    """Parse an array of npm people, e.g. the ``contributors`` field."""
+    parse_string = _person_cache.get_or_compute
+    return [
+        (
+            parse_string(person, _parse_person_string)
+            if isinstance(person, str)
+            else parse_person(person)
+        )
+        for person in people
+    ]
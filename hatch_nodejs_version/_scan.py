@@ -0,0 +1,328 @@
+# SPDX-FileCopyrightText: 2022-present Angus Hollands <goosey15@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""Byte-level scanning of the top-level members of a JSON object.
+
+The scanner tracks nesting depth and skips over nested values without decoding
+them, so that a few top-level members can be located without parsing the
+whole document. It does not validate the parts of the document that it skips;
+whenever it meets something it does not understand it raises `ScanError`, and
+callers fall back to a full parse.
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import re
+from typing import Any, Callable, Collection, Iterator
+
+from ._json import loads_json
+from .trace import span
+
+_WHITESPACE = re.compile(rb"[ \t\n\r]*")
+# Everything up to the next bracket, consuming whole strings without escapes.
+# The regex engine keeps state for each repetition of a group, so runs are
+# bounded to keep its memory use constant
+_CONTAINER_RUN = re.compile(rb'(?:[^"{}\[\]]*"[^"\\]*"){0,256}[^"{}\[\]]*')
+_SCALAR = re.compile(rb"[^ \t\n\r,:{}\[\]\"]+")
+
+# Skipping is several times slower per byte than `json.loads`, so beyond this
+# many bytes a full parse is the faster route to a member
+SCAN_LIMIT = 1 << 20
+# Smaller files are read rather than mapped. A mapped file that is truncated
+# by another process during a scan raises SIGBUS, which would crash the
+# process, so only files too large to copy cheaply are mapped
+MAP_THRESHOLD = 1 << 20
+
+
+class ScanError(ValueError):
+    """The scanner could not give a definite answer."""
+
+
+def _skip_whitespace(buf, pos: int, endpos: int) -> int:
+    return _WHITESPACE.match(buf, pos, endpos).end()
+
+
+def _skip_string(buf, pos: int, endpos: int) -> int:
+    # `pos` is the offset of the opening quote. The string ends at the first
+    # quote that is preceded by an even number of backslashes
+    end = pos
+    while True:
+        end = buf.find(b'"', end + 1, endpos)
+        if end < 0:
+            raise ScanError(f"unterminated string at offset {pos}")
+        escape = end
+        while buf[escape - 1] == 0x5C:
+            escape -= 1
+        if not (end - escape) % 2:
+            return end + 1
+
+
+def skip_value(buf, pos: int, endpos: int) -> int:
+    """Return the offset just past the JSON value starting at ``pos``, which must
+    end before ``endpos``.
+    """
+    char = buf[pos : min(pos + 1, endpos)]
+    if char == b'"':
+        return _skip_string(buf, pos, endpos)
+
+    if char in (b"{", b"["):
+        depth = 1
+        pos += 1
+        while True:
+            pos = _CONTAINER_RUN.match(buf, pos, endpos).end()
+            token = buf[pos : min(pos + 1, endpos)]
+            if token == b'"':
+                # The run ended at its bound, or at a string with escapes
+                pos = _skip_string(buf, pos, endpos)
+                continue
+            pos += 1
+            if token in (b"{", b"["):
+                depth += 1
+            elif token in (b"}", b"]"):
+                depth -= 1
+                if not depth:
+                    return pos
+            else:
+                raise ScanError("unterminated container")
+
+    match = _SCALAR.match(buf, pos, endpos)
+    if match is None:
+        raise ScanError(f"unexpected character at offset {pos}")
+    return match.end()
+
+
+def _decode_key(raw: bytes) -> str:
+    if b"\\" in raw:
+        return json.loads(raw)
+    return raw[1:-1].decode("utf-8")
+
+
+def _iter_object(buf, pos: int, endpos: int) -> Iterator[tuple[str, int, int]]:
+    # `pos` is the offset of the opening brace
+    pos = _skip_whitespace(buf, pos + 1, endpos)
+    if buf[pos : min(pos + 1, endpos)] == b"}":
+        return
+
+    while True:
+        if buf[pos : min(pos + 1, endpos)] != b'"':
+            raise ScanError(f"expected a key at offset {pos}")
+        key_end = _skip_string(buf, pos, endpos)
+        key = _decode_key(buf[pos:key_end])
+
+        pos = _skip_whitespace(buf, key_end, endpos)
+        if buf[pos : min(pos + 1, endpos)] != b":":
+            raise ScanError(f"expected ':' at offset {pos}")
+
+        start = _skip_whitespace(buf, pos + 1, endpos)
+        end = skip_value(buf, start, endpos)
+        yield key, start, end
+
+        pos = _skip_whitespace(buf, end, endpos)
+        char = buf[pos : min(pos + 1, endpos)]
+        if char == b"}":
+            return
+        if char != b",":
+            raise ScanError(f"expected ',' or '}}' at offset {pos}")
+        pos = _skip_whitespace(buf, pos + 1, endpos)
+
+
+def _iter_array(buf, pos: int, endpos: int) -> Iterator[tuple[int, int]]:
+    # `pos` is the offset of the opening bracket
+    pos = _skip_whitespace(buf, pos + 1, endpos)
+    if buf[pos : min(pos + 1, endpos)] == b"]":
+        return
+
+    while True:
+        end = skip_value(buf, pos, endpos)
+        yield pos, end
+
+        pos = _skip_whitespace(buf, end, endpos)
+        char = buf[pos : min(pos + 1, endpos)]
+        if char == b"]":
+            return
+        if char != b",":
+            raise ScanError(f"expected ',' or ']' at offset {pos}")
+        pos = _skip_whitespace(buf, pos + 1, endpos)
+
+
+def iter_members(buf, limit: int | None = None) -> Iterator[tuple[str, int, int]]:
+    """Yield ``(key, start, end)`` for each member of the top-level object, where
+    ``buf[start:end]`` is the raw member value. If ``limit`` is given, raise
+    `ScanError` rather than scanning past that offset. Iteration ends at the
+    closing brace, so anything that follows it is not examined.
+    """
+    endpos = len(buf) if limit is None else min(len(buf), limit)
+
+    pos = _skip_whitespace(buf, 0, endpos)
+    if buf[pos : min(pos + 1, endpos)] != b"{":
+        raise ScanError("top-level value is not an object")
+    yield from _iter_object(buf, pos, endpos)
+
+
+def _may_recur(buf, key: str, pos: int) -> bool:
+    # Whether another member named `key` may follow `pos`. Unless the key needs
+    # escaping, a later member is spelled either verbatim or with `\u` escapes.
+    # Searching the bytes is far cheaper than scanning, so `buf` is searched to
+    # its end, and the (fast) search for a lone backslash rules out most escapes
+    quoted = json.dumps(key, ensure_ascii=False)
+    if "\\" in quoted or "/" in key:
+        return True
+    if buf.find(b"\\", pos) >= 0 and buf.find(b"\\u", pos) >= 0:
+        return True
+    return buf.find(quoted.encode(), pos) >= 0
+
+
+def _last_member(
+    buf, members: Iterator[tuple[str, int, int]], key: str
+) -> tuple[int, int] | None:
+    # As with `json.loads`, the last of any duplicate members is used. The
+    # remaining members are only scanned if `buf` may hold another `key`
+    found = None
+    for name, start, end in members:
+        if name == key:
+            found = start, end
+            if not _may_recur(buf, key, end):
+                break
+    return found
+
+
+def find_member(buf, key: str, limit: int | None = None) -> tuple[int, int] | None:
+    """Return the span of the top-level member named ``key``, or `None` if the
+    object has no such member. As with ``json.loads``, the last of any duplicate
+    members is used.
+    """
+    return _last_member(buf, iter_members(buf, limit), key)
+
+
+def parse_pointer(pointer: str) -> list[str]:
+    """Split a JSON pointer (RFC 6901) to a member, e.g. ``/jupyterlab/version``,
+    into its reference tokens.
+    """
+    if not (isinstance(pointer, str) and pointer.startswith("/")):
+        raise ValueError(f"Invalid JSON pointer: {pointer!r}")
+    return [
+        token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")
+    ]
+
+
+def _is_index(token: str) -> bool:
+    return token.isascii() and token.isdigit() and (token == "0" or token[0] != "0")
+
+
+def find_pointer(buf, pointer: str, limit: int | None = None) -> tuple[int, int] | None:
+    """Return the span of the value referenced by the JSON pointer ``pointer``,
+    or `None` if the pointer does not resolve. Members are matched as by
+    `find_member`.
+    """
+    endpos = len(buf) if limit is None else min(len(buf), limit)
+    tokens = parse_pointer(pointer)
+
+    start = _skip_whitespace(buf, 0, endpos)
+    if buf[start : min(start + 1, endpos)] != b"{":
+        raise ScanError("top-level value is not an object")
+
+    for token in tokens:
+        char = buf[start : min(start + 1, endpos)]
+        if char == b"{":
+            span = _last_member(buf, _iter_object(buf, start, endpos), token)
+            if span is None:
+                return None
+            start, end = span
+        elif char == b"[" and _is_index(token):
+            index = int(token)
+            for i, (start, end) in enumerate(_iter_array(buf, start, endpos)):
+                if i == index:
+                    break
+            else:
+                return None
+        else:
+            return None
+    return start, end
+
+
+def loads_member(data, key: str, loads: Callable[[Any], Any] = loads_json) -> Any:
+    """Decode the top-level member ``key`` of the JSON object in ``data``.
+
+    ``data`` is scanned only as far as the last occurrence of ``key``, which is
+    usually the first, as later duplicates are ruled out by searching the rest
+    of ``data`` for its name. If the scan is inconclusive, or would run past
+    `SCAN_LIMIT`, the whole document is parsed by ``loads`` instead.
+
+    The members that are skipped, and anything after the member that is
+    found, are not validated. For a valid document the result is that of
+    ``json.loads(data.decode("utf-8"))[key]``, but an invalid one only raises
+    an error if the scan or the member itself is invalid.
+    """
+    try:
+        span = find_member(data, key, SCAN_LIMIT)
+        if span is not None:
+            start, end = span
+            return json.loads(data[start:end])
+    except ValueError:
+        # Inconclusive scans and undecodable values are handled by the full parse
+        pass
+
+    return loads(data)[key]
+
+
+def loads_members(
+    data, keys: Collection[str], loads: Callable[[Any], Any] = loads_json
+) -> Any:
+    """Decode the top-level members named by ``keys`` of the JSON object in
+    ``data``, returning them as a dict.
+
+    Every other member is skipped without being decoded (or validated), so that
+    memory use depends on the size of the requested members rather than that of
+    the document. As with ``json.loads``, the last of any duplicate members is
+    used. If the scan is inconclusive, the whole document is parsed by ``loads``
+    and returned instead.
+    """
+    try:
+        spans = {
+            key: (start, end) for key, start, end in iter_members(data) if key in keys
+        }
+        return {key: loads(data[start:end]) for key, (start, end) in spans.items()}
+    except ValueError:
+        # Inconclusive scans and undecodable values are handled by the full parse
+        pass
+
+    return loads(data)
+
+
+def _read_mapped(path: str, read: Callable[[Any], Any]) -> Any:
+    with span("scan") as s, open(path, "rb") as f:
+        buf = None
+        if os.fstat(f.fileno()).st_size >= MAP_THRESHOLD:
+            # Large files are still mapped, and so are not guarded against
+            # truncation by another process during the scan
+            try:
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                pass
+
+        if buf is None:
+            data = f.read()
+            s.read(len(data))
+            return read(data)
+
+        with buf:
+            s.read(len(buf))
+            return read(buf)
+
+
+def read_member(path: str, key: str, loads: Callable[[Any], Any] = loads_json) -> Any:
+    """Read the top-level member ``key`` of the JSON object stored at ``path``,
+    as `loads_member` does.
+    """
+    return _read_mapped(path, lambda data: loads_member(data, key, loads))
+
+
+def read_members(
+    path: str, keys: Collection[str], loads: Callable[[Any], Any] = loads_json
+) -> Any:
+    """Read the top-level members named by ``keys`` of the JSON object stored at
+    ``path``, as `loads_members` does.
+    """
+    return _read_mapped(path, lambda data: loads_members(data, keys, loads))
@@ -0,0 +1,258 @@
+# SPDX-FileCopyrightText: 2022-present Angus Hollands <goosey15@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import functools
+import os
+import stat
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Collection, Hashable, NamedTuple
+
+from ._json import get_loads
+from ._scan import read_members
+from .trace import span
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    currsize: int
+
+
+class LRUCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+@functools.lru_cache(maxsize=None)
+def _json_loader(loads: Callable[[bytes], Any]) -> Callable[[str], Any]:
+    # One loader per backend, so that cache entries are keyed by backend
+    def load_json(path: str) -> Any:
+        with span("read") as s:
+            with open(path, "rb") as f:
+                data = f.read()
+            s.read(len(data))
+
+        with span("parse"):
+            return loads(data)
+
+    return load_json
+
+
+@functools.lru_cache(maxsize=None)
+def _members_loader(
+    loads: Callable[[bytes], Any], keys: frozenset[str]
+) -> Callable[[str], Any]:
+    def load_members(path: str) -> Any:
+        return read_members(path, keys, loads)
+
+    return load_members
+
+
+# The number of independently locked shards of each cache. Threads contend for
+# a shard only when their keys hash to it, which matters on free-threaded
+# builds, where there is no GIL to serialise them anyway
+SHARDS = 16
+# Shards of an `LRUCache` hold at least this many entries, so that the
+# eviction order of small caches remains exact
+MIN_SHARD_SIZE = 256
+
+
+class _EntriesShard:
+    __slots__ = ("entries", "lock", "hits", "misses")
+
+    def __init__(self):
+        self.entries: dict[str, tuple[tuple[int, int, int], dict]] = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+
+class PackageJSONCache:
+    """Process-wide cache of values derived from ``package.json`` files.
+
+    Entries are keyed on the resolved path, and are only reused whilst the
+    ``(st_ino, st_mtime_ns, st_size)`` signature of the file is unchanged. Each
+    entry can hold several derived values (e.g. the parsed document), one per
+    loader. Cached values are shared between callers and must not be mutated.
+    Entries are spread over `SHARDS` independently locked shards by path.
+    """
+
+    def __init__(self):
+        self._shards = tuple(_EntriesShard() for _ in range(SHARDS))
+
+    def _shard(self, resolved: str) -> _EntriesShard:
+        return self._shards[hash(resolved) % SHARDS]
+
+    @staticmethod
+    def _stat(root: str, path: str) -> tuple[str, tuple[int, int, int]]:
+        resolved = os.path.realpath(os.path.join(root, path))
+        try:
+            st = os.stat(resolved)
+        except OSError:
+            st = None
+        if st is None or not stat.S_ISREG(st.st_mode):
+            raise OSError(f"file does not exist: {path}")
+        return resolved, (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def get(
+        self,
+        root: str,
+        path: str,
+        loader: Callable[[str], Any],
+        key: Hashable = None,
+    ) -> Any:
+        """Return ``loader(resolved_path)``, re-using a cached result if the file
+        is unchanged. ``key`` identifies the loader, and defaults to the loader
+        itself.
+        """
+        if key is None:
+            key = loader
+        resolved, signature = self._stat(root, path)
+        shard = self._shard(resolved)
+
+        with shard.lock:
+            entry = shard.entries.get(resolved)
+            if entry is not None and entry[0] == signature and key in entry[1]:
+                shard.hits += 1
+                return entry[1][key]
+            shard.misses += 1
+
+        value = loader(resolved)
+
+        with shard.lock:
+            entry = shard.entries.get(resolved)
+            # Drop values derived from a stale version of the file
+            if entry is None or entry[0] != signature:
+                entry = shard.entries[resolved] = (signature, {})
+            entry[1][key] = value
+        return value
+
+    def load(self, root: str, path: str, backend: str | None = None) -> Any:
+        """Return the parsed JSON document at ``path`` relative to ``root``,
+        decoded by the JSON ``backend``.
+        """
+        return self.get(root, path, _json_loader(get_loads(backend)))
+
+    def load_members(
+        self,
+        root: str,
+        path: str,
+        keys: Collection[str],
+        backend: str | None = None,
+    ) -> Any:
+        """Return the top-level members named by ``keys`` of the JSON document at
+        ``path`` relative to ``root``, decoded by the JSON ``backend``. The other
+        members are skipped, as by `_scan.loads_members`.
+        """
+        return self.get(
+            root, path, _members_loader(get_loads(backend), frozenset(keys))
+        )
+
+    def invalidate(self, root: str, path: str):
+        """Forget any values derived from the file at ``path``."""
+        resolved = os.path.realpath(os.path.join(root, path))
+        shard = self._shard(resolved)
+        with shard.lock:
+            shard.entries.pop(resolved, None)
+
+    def cache_info(self) -> CacheInfo:
+        hits = misses = currsize = 0
+        for shard in self._shards:
+            with shard.lock:
+                hits += shard.hits
+                misses += shard.misses
+                currsize += len(shard.entries)
+        return CacheInfo(hits, misses, currsize)
+
+    def cache_clear(self):
+        for shard in self._shards:
+            with shard.lock:
+                shard.entries.clear()
+                shard.hits = 0
+                shard.misses = 0
+
+
+class _LRUShard:
+    __slots__ = ("data", "lock", "maxsize", "hits", "misses", "evictions")
+
+    def __init__(self, maxsize: int):
+        self.data: OrderedDict[Hashable, Any] = OrderedDict()
+        self.lock = threading.Lock()
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+class LRUCache:
+    """Bounded, thread-safe mapping that evicts the least recently used entry.
+
+    Entries are spread by key over up to `SHARDS` independently locked shards,
+    each of at least `MIN_SHARD_SIZE` entries, and are evicted in least
+    recently used order within their shard.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        if maxsize < 1:
+            raise ValueError("maxsize must be a positive integer")
+        self.maxsize = maxsize
+
+        shards = 1
+        while shards < SHARDS and maxsize // (shards * 2) >= MIN_SHARD_SIZE:
+            shards *= 2
+        size, remainder = divmod(maxsize, shards)
+        self._shards = tuple(_LRUShard(size + (i < remainder)) for i in range(shards))
+        self._mask = shards - 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[Any], Any]) -> Any:
+        """Return the value for ``key``, storing ``compute(key)`` on a miss.
+        Exceptions raised by ``compute`` propagate and are not cached.
+        """
+        shard = self._shards[hash(key) & self._mask]
+        data = shard.data
+        with shard.lock:
+            try:
+                value = data[key]
+            except KeyError:
+                shard.misses += 1
+            else:
+                shard.hits += 1
+                data.move_to_end(key)
+                return value
+
+        value = compute(key)
+
+        with shard.lock:
+            data[key] = value
+            data.move_to_end(key)
+            while len(data) > shard.maxsize:
+                data.popitem(last=False)
+                shard.evictions += 1
+        return value
+
+    def cache_info(self) -> LRUCacheInfo:
+        hits = misses = evictions = currsize = 0
+        for shard in self._shards:
+            with shard.lock:
+                hits += shard.hits
+                misses += shard.misses
+                evictions += shard.evictions
+                currsize += len(shard.data)
+        return LRUCacheInfo(hits, misses, evictions, self.maxsize, currsize)
+
+    def cache_clear(self):
+        for shard in self._shards:
+            with shard.lock:
+                shard.data.clear()
+                shard.hits = 0
+                shard.misses = 0
+                shard.evictions = 0
+
+
+package_json_cache = PackageJSONCache()
@@ -3,15 +3,20 @@
 # SPDX-License-Identifier: MIT
 from hatchling.plugin import hookimpl
 
-from .metadata_source import NodeJSMetadataHook
-from .version_source import NodeJSVersionSource
+# The plugin modules are only imported once hatchling asks for that kind of
+# plugin, so that e.g. a project using only the version source does not pay for
+# importing the metadata hook.
 
 
 @hookimpl
 def hatch_register_version_source():
+    from .version_source import NodeJSVersionSource
+
     return NodeJSVersionSource
 
 
 @hookimpl
 def hatch_register_metadata_hook():
+    from .metadata_source import NodeJSMetadataHook
+
     return NodeJSMetadataHook
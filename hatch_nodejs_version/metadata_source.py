@@ -3,18 +3,27 @@
 # SPDX-License-Identifier: MIT
 from __future__ import annotations
 
-import json
-import os.path
+import functools
+import os
 import re
-import urllib.parse
-from typing import Any
+from typing import Any, Callable
 
 from hatchling.metadata.plugin.interface import MetadataHookInterface
 
+from . import trace
+from ._config import ConfigurationError, MetadataHookOptions  # noqa: F401 (re-exported)
+from ._io import read_file
+from ._json import copy_json, get_loads
+from ._person import parse_people, parse_person
+from ._scan import loads_members
+from .cache import package_json_cache
+
+# The grammar of npm person strings, as implemented by `_person.parse_person_string`
 AUTHOR_PATTERN = (
     r"^(?P<name>[^<(]+?)?[ \t]*(?:<(?P<email>[^>(]+?)>)?[ \t]*(?:\((?P<url>[^)]+?)\)|$)"
 )
 REPOSITORY_PATTERN = r"^(?:(gist|bitbucket|gitlab|github):)?(.*?)$"
+REPOSITORY_REGEX = re.compile(REPOSITORY_PATTERN)
 REPOSITORY_TABLE = {
     "gitlab": "https://gitlab.com",
     "github": "https://github.com",
@@ -29,105 +38,129 @@ class NodeJSMetadataHook(MetadataHookInterface):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        self.__path = None
-        self.__fields = None
-        self.__contributors_as_maintainers = None
-        self.__homepage_label = None
-        self.__bugs_label = None
-        self.__repository_label = None
+        self.__options = None
+        self.__projection = None
+        self.__package_keys = None
+
+    @property
+    def options(self) -> MetadataHookOptions:
+        """The validated options, which are shared with every metadata hook of an
+        equal configuration.
+        """
+        if self.__options is None:
+            self.__options = MetadataHookOptions.from_config(
+                self.config, self.PLUGIN_NAME
+            )
+        return self.__options
 
     @property
     def path(self) -> str:
-        if self.__path is None:
-            version_file = self.config.get("path", "package.json")
-            if not isinstance(version_file, str):
-                raise TypeError(
-                    "Option `path` for metadata hook `{}` must be a string".format(
-                        self.PLUGIN_NAME
-                    )
-                )
+        return self.options.path
+
+    @property
+    def fields(self) -> None | frozenset[str]:
+        return self.options.fields
+
+    @property
+    def contributors_as_maintainers(self) -> bool:
+        return self.options.contributors_as_maintainers
 
-            self.__path = version_file
+    @property
+    def homepage_label(self) -> str:
+        return self.options.homepage_label
 
-        return self.__path
+    @property
+    def bugs_label(self) -> str:
+        return self.options.bugs_label
 
     @property
-    def fields(self) -> None | set[str]:
-        if self.__fields is None:
-            fields = self.config.get("fields", None)
-            if fields is None:
-                self.__fields = None
-            else:
-                if not (
-                    isinstance(fields, list) and all(isinstance(f, str) for f in fields)
-                ):
-                    raise TypeError(
-                        "Option `fields` for metadata hook `{}` "
-                        "must be a list of strings".format(self.PLUGIN_NAME)
-                    )
-                self.__fields = set(fields)
-        return self.__fields
+    def repository_label(self) -> str:
+        return self.options.repository_label
 
     @property
-    def contributors_as_maintainers(self) -> bool:
-        if self.__contributors_as_maintainers is None:
-            contributors_as_maintainers = self.config.get(
-                "contributors-as-maintainers", True
-            )
-            if not isinstance(contributors_as_maintainers, bool):
-                raise TypeError(
-                    "Option `contributors-as-maintainers` for metadata hook `{}` "
-                    "must be a boolean".format(self.PLUGIN_NAME)
-                )
-            self.__contributors_as_maintainers = contributors_as_maintainers
-        return self.__contributors_as_maintainers
+    def cache_dir(self) -> str | None:
+        return self.options.cache_dir
 
     @property
-    def homepage_label(self) -> bool:
-        if self.__homepage_label is None:
-            homepage_label = self.config.get("homepage-label", "Homepage")
-
-            if not isinstance(homepage_label, str):
-                raise TypeError(
-                    "Option `homepage-label` for metadata hook `{}` "
-                    "must be a string".format(self.PLUGIN_NAME)
-                )
-            self.__homepage_label = homepage_label
-        return self.__homepage_label
+    def json_backend(self) -> str | None:
+        return self.options.json_backend
 
     @property
-    def bugs_label(self) -> bool:
-        if self.__bugs_label is None:
-            bug_tracker_label = self.config.get("bugs-label", "Bug Tracker")
-
-            if not isinstance(bug_tracker_label, str):
-                raise TypeError(
-                    "Option `bugs-label` for metadata hook `{}` "
-                    "must be a string".format(self.PLUGIN_NAME)
-                )
-            self.__bugs_label = bug_tracker_label
-        return self.__bugs_label
+    def inherit(self) -> bool:
+        return self.options.inherit
 
     @property
-    def repository_label(self) -> bool:
-        if self.__repository_label is None:
-            bug_tracker_label = self.config.get("repository-label", "Repository")
-
-            if not isinstance(bug_tracker_label, str):
-                raise TypeError(
-                    "Option `repository-label` for metadata hook `{}` "
-                    "must be a string".format(self.PLUGIN_NAME)
-                )
-            self.__repository_label = bug_tracker_label
-        return self.__repository_label
+    def trace_file(self) -> str | None:
+        return self.options.trace_file
+
+    @property
+    def _trace_path(self) -> str | None:
+        if self.trace_file is None:
+            return None
+        return os.path.join(self.root, self.trace_file)
+
+    @property
+    def projection(
+        self,
+    ) -> tuple[tuple[str, Callable[[NodeJSMetadataHook, dict[str, Any]], Any]], ...]:
+        """The ``(field, extractor)`` pairs for the requested fields."""
+        if self.__projection is None:
+            self.__projection = _compile_projection(self.fields)
+        return self.__projection
+
+    @property
+    def package_keys(self) -> frozenset[str]:
+        """The top-level ``package.json`` members that the requested fields are
+        derived from.
+        """
+        if self.__package_keys is None:
+            self.__package_keys = _compile_package_keys(self.fields)
+        return self.__package_keys
 
     def load_package_data(self):
-        path = os.path.normpath(os.path.join(self.root, self.path))
-        if not os.path.isfile(path):
-            raise OSError(f"file does not exist: {self.path}")
+        with trace.session("load_package_data", self.path, self._trace_path):
+            # The parsed document is shared by every caller, so each gets a copy
+            return copy_json(
+                package_json_cache.load(self.root, self.path, self.json_backend)
+            )
+
+    def load_package_metadata(self) -> dict[str, Any]:
+        """Load only the `package_keys` members of ``package.json``, skipping the
+        rest of the document (e.g. ``dependencies``) without decoding it. With
+        `inherit`, members that it lacks are taken from its workspace ancestors.
+        """
+        with trace.session("load_package_metadata", self.path, self._trace_path):
+            return copy_json(self._load_package_metadata())
+
+    def _load_package_metadata(self) -> dict[str, Any]:
+        # The result is shared with other callers, and must not be mutated
+        if not self.inherit:
+            return package_json_cache.load_members(
+                self.root, self.path, self.package_keys, self.json_backend
+            )
+
+        from ._inherit import merge_inherited
+
+        # The workspace root is recognised by its `workspaces`
+        package = package_json_cache.load_members(
+            self.root,
+            self.path,
+            self.package_keys | {"workspaces"},
+            self.json_backend,
+        )
+        return merge_inherited(package, self._load_inherited())
+
+    def _load_inherited(self) -> dict[str, Any]:
+        from ._inherit import load_inherited
 
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        path = os.path.realpath(os.path.join(self.root, self.path))
+        return load_inherited(path, self.package_keys, self.json_backend)
+
+    async def aload_package_data(self):
+        """Equivalent to `load_package_data`, without blocking the event loop."""
+        from ._aio import run_blocking
+
+        return await run_blocking(self.load_package_data)
 
     def _parse_bugs(self, bugs: str | dict[str, str]) -> str | None:
         if isinstance(bugs, str):
@@ -138,30 +171,18 @@ class NodeJSMetadataHook(MetadataHookInterface):
 
         return bugs["url"]
 
-    def _parse_person(self, person: dict[str, str]) -> dict[str, str]:
-        result = {}
-        if isinstance(person, dict):
-            if {"url", "email"} & person.keys():
-                result["name"] = person["name"]
-                if "email" in person:
-                    result["email"] = person["email"]
-                return result
-            else:
-                author = person["name"]
-        else:
-            author = person
-        match = re.match(AUTHOR_PATTERN, author)
-        if match is None:
-            raise ValueError(f"Invalid author name: {author}")
-        name, email, _ = match.groups()
-        result = {"name": name}
-        if email is not None:
-            result["email"] = email
-        return result
+    def _parse_person(self, person: str | dict[str, str]) -> dict[str, str]:
+        return parse_person(person).as_dict()
+
+    def _parse_people(self, people: list[str | dict[str, str]]) -> list[dict[str, str]]:
+        with trace.span("people"):
+            return [p.as_dict() for p in parse_people(people)]
 
     def _parse_repository(self, repository: str | dict[str, str]) -> str:
         if isinstance(repository, str):
-            match = re.match(REPOSITORY_PATTERN, repository)
+            import urllib.parse
+
+            match = REPOSITORY_REGEX.match(repository)
             if match is None:
                 raise ValueError(f"Invalid repository string: {repository}")
             kind, identifier = match.groups()
@@ -171,40 +192,37 @@ class NodeJSMetadataHook(MetadataHookInterface):
 
         return repository["url"]
 
-    def update(self, metadata: dict[str, Any]):
-        package = self.load_package_data()
-
-        new_metadata = {"name": package["name"]}
+    # Values are copied by the extractors, as the package is shared with other
+    # callers, and the metadata is handed to Hatchling
+    def _extract_name(self, package: dict[str, Any]) -> Any:
+        return copy_json(package["name"])
 
+    def _extract_authors(self, package: dict[str, Any]) -> Any:
         authors = None
-        maintainers = None
-
         if "author" in package:
-            authors = [self._parse_person(package["author"])]
-
-        if "contributors" in package:
-            contributors = [self._parse_person(p) for p in package["contributors"]]
-            if self.contributors_as_maintainers:
-                maintainers = contributors
-            else:
-                authors = [*(authors or []), *contributors]
+            with trace.span("people"):
+                authors = [self._parse_person(package["author"])]
 
-        if authors is not None:
-            new_metadata["authors"] = authors
+        if "contributors" in package and not self.contributors_as_maintainers:
+            contributors = self._parse_people(package["contributors"])
+            authors = [*(authors or []), *contributors]
+        return _MISSING if authors is None else authors
 
-        if maintainers is not None:
-            new_metadata["maintainers"] = maintainers
+    def _extract_maintainers(self, package: dict[str, Any]) -> Any:
+        if "contributors" in package and self.contributors_as_maintainers:
+            return self._parse_people(package["contributors"])
+        return _MISSING
 
-        if "keywords" in package:
-            new_metadata["keywords"] = package["keywords"]
+    def _extract_keywords(self, package: dict[str, Any]) -> Any:
+        return copy_json(package.get("keywords", _MISSING))
 
-        if "description" in package:
-            new_metadata["description"] = package["description"]
+    def _extract_description(self, package: dict[str, Any]) -> Any:
+        return copy_json(package.get("description", _MISSING))
 
-        if "license" in package:
-            new_metadata["license"] = package["license"]
+    def _extract_license(self, package: dict[str, Any]) -> Any:
+        return copy_json(package.get("license", _MISSING))
 
-        # Construct URLs
+    def _extract_urls(self, package: dict[str, Any]) -> Any:
         urls = {}
         if "homepage" in package:
             urls[self.homepage_label] = package["homepage"]
@@ -214,16 +232,105 @@ class NodeJSMetadataHook(MetadataHookInterface):
                 urls[self.bugs_label] = bugs_url
         if "repository" in package:
             urls[self.repository_label] = self._parse_repository(package["repository"])
+        return urls or _MISSING
 
-        # Write URLs
-        if urls:
-            new_metadata["urls"] = urls
-
-        # Only use required metadata
-        metadata.update(
-            {
-                k: v
-                for k, v in new_metadata.items()
-                if (self.fields is None or k in self.fields)
-            }
-        )
+    def _project(self, package: dict[str, Any], metadata: dict[str, Any]):
+        # Only the extractors of the requested fields are run
+        for field, extract in self.projection:
+            value = extract(self, package)
+            if value is not _MISSING:
+                metadata[field] = value
+
+    def update(self, metadata: dict[str, Any]):
+        with trace.session("update", self.path, self._trace_path):
+            if self.cache_dir is None:
+                self._project(self._load_package_metadata(), metadata)
+            else:
+                self._update_cached(metadata)
+
+    async def aupdate(self, metadata: dict[str, Any]):
+        """Equivalent to `update`, without blocking the event loop."""
+        from ._aio import run_blocking
+
+        await run_blocking(self.update, metadata)
+
+    def _update_cached(self, metadata: dict[str, Any]):
+        from ._disk_cache import DiskCache
+
+        with trace.span("read") as s:
+            content = read_file(self.root, self.path)
+            s.read(len(content))
+
+        cache = DiskCache(os.path.join(self.root, self.cache_dir))
+        keys = self.package_keys
+        if self.inherit:
+            from ._inherit import merge_inherited
+
+            # The derived metadata also depends upon the ancestors
+            inherited = self._load_inherited()
+            keys = keys | {"workspaces"}
+            key = cache.key(
+                "inherited-metadata",
+                content,
+                {"config": self.config, "inherited": inherited},
+            )
+        else:
+            key = cache.key("metadata", content, self.config)
+
+        derived = cache.load(key)
+        if derived is None:
+            with trace.span("parse"):
+                package = loads_members(content, keys, get_loads(self.json_backend))
+            if self.inherit:
+                package = merge_inherited(package, inherited)
+            derived = {}
+            self._project(package, derived)
+            cache.store(key, derived)
+        metadata.update(derived)
+
+
+# Sentinel for fields that are absent from package.json
+_MISSING = object()
+
+# Extractors for each supported PEP 621 field, in the order that they are written
+_FIELD_EXTRACTORS = {
+    "name": NodeJSMetadataHook._extract_name,
+    "authors": NodeJSMetadataHook._extract_authors,
+    "maintainers": NodeJSMetadataHook._extract_maintainers,
+    "keywords": NodeJSMetadataHook._extract_keywords,
+    "description": NodeJSMetadataHook._extract_description,
+    "license": NodeJSMetadataHook._extract_license,
+    "urls": NodeJSMetadataHook._extract_urls,
+}
+
+# The package.json members that each field is derived from
+_FIELD_KEYS = {
+    "name": ("name",),
+    "authors": ("author", "contributors"),
+    "maintainers": ("contributors",),
+    "keywords": ("keywords",),
+    "description": ("description",),
+    "license": ("license",),
+    "urls": ("homepage", "bugs", "repository"),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_projection(
+    fields: frozenset[str] | None,
+) -> tuple[tuple[str, Callable[[NodeJSMetadataHook, dict[str, Any]], Any]], ...]:
+    return tuple(
+        (field, extract)
+        for field, extract in _FIELD_EXTRACTORS.items()
+        if fields is None or field in fields
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_package_keys(fields: frozenset[str] | None) -> frozenset[str]:
+    return frozenset(
+        key
+        for field, keys in _FIELD_KEYS.items()
+        if fields is None or field in fields
+        for key in keys
+    )
@@ -0,0 +1,158 @@
+# SPDX-FileCopyrightText: 2022-present Angus Hollands <goosey15@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""Opt-in timing of the phases of each plugin operation.
+
+Tracing is enabled by any of:
+
+- setting the `TRACE_ENV_VAR` environment variable to the path of a file;
+- the ``trace-file`` option of either plugin;
+- registering a callback with `add_callback`.
+
+Each phase (``read``, ``scan``, ``parse``, ``convert``, ``people`` or
+``write``) of an operation (e.g. ``get_version_data``) produces a record such
+as::
+
+    {"operation": "get_version_data", "phase": "scan", "path": "package.json",
+     "duration": 0.0001, "bytes_read": 1024, "bytes_written": 0, "pid": 123}
+
+Records are appended as JSON lines to the trace file(s) and passed to every
+callback. When tracing is disabled, a phase costs a single context lookup.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable
+
+TRACE_ENV_VAR = "HATCH_NODEJS_VERSION_TRACE"
+
+# Replaced rather than mutated, so that sessions can iterate over the callbacks
+# without a lock whilst other threads add or remove them
+_callbacks: tuple[Callable[[dict[str, Any]], None], ...] = ()
+_callbacks_lock = threading.Lock()
+
+
+def add_callback(callback: Callable[[dict[str, Any]], None]):
+    """Call ``callback(record)`` for every traced phase."""
+    global _callbacks
+
+    with _callbacks_lock:
+        _callbacks = (*_callbacks, callback)
+
+
+def remove_callback(callback: Callable[[dict[str, Any]], None]):
+    global _callbacks
+
+    with _callbacks_lock:
+        callbacks = list(_callbacks)
+        callbacks.remove(callback)
+        _callbacks = tuple(callbacks)
+
+
+class _Session:
+    __slots__ = ("operation", "path", "trace_files", "token")
+
+    def __init__(self, operation: str, path: str, trace_files: tuple[str, ...]):
+        self.operation = operation
+        self.path = path
+        self.trace_files = trace_files
+        self.token = None
+
+    def __enter__(self):
+        self.token = _session.set(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        _session.reset(self.token)
+
+    def emit(self, record: dict[str, Any]):
+        if self.trace_files:
+            line = json.dumps(record) + "\n"
+            for trace_file in self.trace_files:
+                with open(trace_file, "a", encoding="utf-8") as f:
+                    f.write(line)
+        for callback in _callbacks:
+            callback(record)
+
+
+class _Span:
+    __slots__ = ("session", "phase", "start", "bytes_read", "bytes_written")
+
+    def __init__(self, session: _Session, phase: str):
+        self.session = session
+        self.phase = phase
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        duration = time.perf_counter() - self.start
+        session = self.session
+        session.emit(
+            {
+                "operation": session.operation,
+                "phase": self.phase,
+                "path": session.path,
+                "duration": duration,
+                "bytes_read": self.bytes_read,
+                "bytes_written": self.bytes_written,
+                "pid": os.getpid(),
+            }
+        )
+
+    def read(self, size: int):
+        self.bytes_read += size
+
+    def wrote(self, size: int):
+        self.bytes_written += size
+
+
+class _NullContext:
+    """Shared stand-in for sessions and spans when tracing is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def read(self, size: int):
+        pass
+
+    def wrote(self, size: int):
+        pass
+
+
+_NULL = _NullContext()
+_session: ContextVar[_Session | None] = ContextVar("session", default=None)
+
+
+def session(operation: str, path: str, trace_file: str | None = None):
+    """Trace the phases of ``operation`` on the file at ``path`` (within this
+    context), if tracing is enabled.
+    """
+    # Nested operations are traced as part of the outermost one
+    if _session.get() is not None:
+        return _NULL
+
+    trace_files = tuple(f for f in (os.environ.get(TRACE_ENV_VAR), trace_file) if f)
+    if not (trace_files or _callbacks):
+        return _NULL
+    return _Session(operation, os.fspath(path), trace_files)
+
+
+def span(phase: str):
+    """Time ``phase`` of the current operation."""
+    current = _session.get()
+    if current is None:
+        return _NULL
+    return _Span(current, phase)
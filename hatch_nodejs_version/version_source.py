@@ -1,12 +1,34 @@
 # SPDX-FileCopyrightText: 2022-present Angus Hollands <goosey15@gmail.com>
 #
 # SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import contextlib
+import functools
 import json
 import os
 import re
+from typing import Any, Callable, Iterable, Optional, Tuple
 
 from hatchling.version.source.plugin.interface import VersionSourceInterface
 
+from . import trace
+from ._config import (  # noqa: F401 (re-exported)
+    LOCK_TIMEOUT,
+    ConfigurationError,
+    VersionSourceOptions,
+)
+from ._io import atomic_write_many, lock_directories, read_file
+from ._json import get_loads
+from ._scan import (
+    ScanError,
+    find_pointer,
+    loads_member,
+    parse_pointer,
+    read_member,
+)
+from .cache import LRUCache, LRUCacheInfo, package_json_cache
+
 PRE_PATTERN = r"""
         (?P<{prefix}pre_l>(a|b|c|rc|alpha|beta|pre|preview))
         [-.]?
@@ -49,13 +71,8 @@ NODE_VERSION_PATTERN = rf"""
     (?:
        \+
        (?P<build>
-            [0-9A-Za-z][0-9A-Za-z-_]*            # non-hyphen/dash leading identifier
-            (?:
-                (?:\.[0-9A-Za-z-_]+)*            # dot-prefixed identifier segments
-            \.                                   # Final dot-delimited segment
-                [0-9A-Za-z_-]*                   # non-hyphen/dash trailing identifier
-                [0-9A-Za-z]
-            )?
+            [0-9A-Za-z]+                         # alphanumeric identifiers,
+            (?:[-_.][0-9A-Za-z]+)*               # separated by one of -_.
         )
    )?
 """
@@ -85,18 +102,422 @@ PYTHON_VERSION_PATTERN = r"""
        (?:                                         # local version number
            \+
            (?P<local>
-                [0-9A-Za-z][0-9A-Za-z-_]*          # non-hyphen/dash leading identifier
-                (?:
-                    (?:\.[0-9A-Za-z-_]+)*          # dot-prefixed identifier
-                    \.
-                    [0-9A-Za-z_-]*                 # non-hyphen/dash trailing identifier
-                    [0-9A-Za-z]
-                )?
-            )
+                [0-9A-Za-z]+                       # alphanumeric identifiers,
+                (?:[-_.][0-9A-Za-z]+)*             # separated by one of -_.
+           )
        )?
    )
 """
 
+# Bounded memos of successful conversions, shared by all callers
+CONVERSION_CACHE_SIZE = 4096
+_node_to_python_cache = LRUCache(CONVERSION_CACHE_SIZE)
+_python_to_node_cache = LRUCache(CONVERSION_CACHE_SIZE)
+
+# The parts of a version, as strings: major, minor, patch, pre-release label,
+# pre-release number, dev-release number, and build (local) label. Absent parts
+# are `None`, and dev releases without a number have the number "0"
+VersionParts = Tuple[
+    str, str, str, Optional[str], Optional[str], Optional[str], Optional[str]
+]
+
+
+# The versions are scanned by hand in a single pass: each component is split
+# from the front of the remainder with a string method, so that the time taken
+# is linear in the worst case. The patterns above remain the reference grammars,
+# matched case-insensitively, but only by ASCII letters, as by `packaging`, and
+# ignoring surrounding whitespace (see the tests). So the rest of a version can
+# be lowered once to match the literals case-insensitively.
+_DIGITS = "0123456789"
+_SEPARATORS = ("-", "_", ".")
+_BUILD_SEPARATORS = str.maketrans("-_", "..")
+# Pre-release labels by their first letter, longest first
+_PRE_LABELS = {
+    "a": ("alpha", "a"),
+    "b": ("beta", "b"),
+    "c": ("c",),
+    "r": ("rc",),
+    "p": ("preview", "pre"),
+}
+
+
+def _invalid(version: str) -> ValueError:
+    return ValueError(f"Version {version!r} did not match regex")
+
+
+def _not_a_string(version: Any) -> TypeError:
+    return TypeError(f"expected a string version, got {type(version).__name__!r}")
+
+
+def _is_plain_release(version: str) -> bool:
+    # Checks that MAJOR.MINOR.PATCH consists of ASCII digits, without allocating
+    return (
+        version.count(".") == 2
+        and not version.strip("0123456789.")
+        and version[0] != "."
+        and version[-1] != "."
+        and ".." not in version
+    )
+
+
+def _split_release(version: str, text: str) -> tuple[str, str, str, str]:
+    """Split MAJOR.MINOR.PATCH from the front of the ASCII ``text``."""
+    components = text.split(".", 2)
+    if len(components) < 3:
+        raise _invalid(version)
+
+    major, minor, rest = components
+    suffix = rest.lstrip(_DIGITS)
+    patch = rest[: len(rest) - len(suffix)]
+    if not (patch and major.isdigit() and minor.isdigit()):
+        raise _invalid(version)
+    return major, minor, patch, suffix
+
+
+def _split_number(text: str) -> tuple[str, str]:
+    """Split the leading digits from ``text``."""
+    rest = text.lstrip(_DIGITS)
+    return text[: len(text) - len(rest)], rest
+
+
+def _match_pre_label(text: str) -> int:
+    """Return the length of the pre-release label that ``text`` starts with."""
+    for label in _PRE_LABELS.get(text[:1], ()):
+        if text.startswith(label):
+            return len(label)
+    return 0
+
+
+def _split_build(version: str, text: str) -> str | None:
+    """Split the optional build label from ``text``, which it must end."""
+    if not text:
+        return None
+
+    build = text[1:]
+    if not (
+        text[0] == "+"
+        # Alphanumeric identifiers, separated by one of -_.
+        and all(map(str.isalnum, build.translate(_BUILD_SEPARATORS).split(".")))
+    ):
+        raise _invalid(version)
+    return build
+
+
+def _parse_node_version(version: str) -> VersionParts:
+    """Parse a version matching `NODE_VERSION_PATTERN`."""
+    if not isinstance(version, str):
+        raise _not_a_string(version)
+
+    text = version.strip()
+    if not text.isascii():
+        raise _invalid(version)
+    major, minor, patch, rest = _split_release(version, text)
+    pre_l = pre_n = dev_n = None
+    if rest[:1] == "-":
+        # Literals are matched in the lowered remainder, and sliced from `text`
+        rest = rest[1:].lower()
+        size = _match_pre_label(rest)
+        if size:
+            start = len(text) - len(rest)
+            pre_l, rest = text[start : start + size], rest[size:]
+            separator = rest[:1]
+            if separator == "-" or separator == ".":
+                pre_n, tail = _split_number(rest[1:])
+                # Without a number, a dot may instead be the one before "dev"
+                if pre_n or not (separator == "." and tail.startswith("dev")):
+                    rest = tail
+            else:
+                pre_n, rest = _split_number(rest)
+            pre_n = pre_n or None
+
+            if rest[:1] == ".":
+                if not rest.startswith("dev", 1):
+                    raise _invalid(version)
+                dev_n, rest = "0", rest[4:]
+        elif rest.startswith("dev"):
+            dev_n, rest = "0", rest[3:]
+        else:
+            raise _invalid(version)
+
+        if dev_n is not None:
+            if rest[:1] == "-" or rest[:1] == ".":
+                rest = rest[1:]
+            number, rest = _split_number(rest)
+            dev_n = number or dev_n
+        rest = text[len(text) - len(rest) :]
+
+    return major, minor, patch, pre_l, pre_n, dev_n, _split_build(version, rest)
+
+
+def _parse_python_version(version: str) -> VersionParts:
+    """Parse a version matching `PYTHON_VERSION_PATTERN`."""
+    if not isinstance(version, str):
+        raise _not_a_string(version)
+
+    text = version.strip()
+    if not text.isascii():
+        raise _invalid(version)
+    if text[:1] == "v" or text[:1] == "V":
+        text = text[1:]
+    major, minor, patch, rest = _split_release(version, text)
+    pre_l = pre_n = dev_n = None
+    if rest:
+        # Literals are matched in the lowered remainder, and sliced from `text`
+        rest = rest.lower()
+        tail = rest[1:] if rest[0] in _SEPARATORS else rest
+        size = _match_pre_label(tail)
+        if size:
+            start = len(text) - len(tail)
+            pre_l, rest = text[start : start + size], tail[size:]
+            # A separator without a number is equivalent to the one before "dev"
+            if rest[:1] in _SEPARATORS:
+                rest = rest[1:]
+            pre_n, rest = _split_number(rest)
+            pre_n = pre_n or None
+
+        tail = rest[1:] if rest[:1] in _SEPARATORS else rest
+        if tail.startswith("dev"):
+            dev_n, rest = _split_number(tail[3:])
+            if not dev_n:
+                raise _invalid(version)
+        rest = text[len(text) - len(rest) :]
+
+    return major, minor, patch, pre_l, pre_n, dev_n, _split_build(version, rest)
+
+
+def _format_python_version(parts: VersionParts) -> str:
+    major, minor, patch, pre_l, pre_n, dev_n, build = parts
+    result = f"{major}.{minor}.{patch}"
+    if pre_l is not None:
+        result += pre_l if pre_n is None else f"{pre_l}{pre_n}"
+    if dev_n is not None:
+        result += f"dev{dev_n}"
+    if build is not None:
+        result += f"+{build}"
+    return result
+
+
+def _format_node_version(parts: VersionParts) -> str:
+    major, minor, patch, pre_l, pre_n, dev_n, build = parts
+    result = f"{major}.{minor}.{patch}"
+    if pre_l is not None:
+        result += f"-{pre_l}" if pre_n is None else f"-{pre_l}{pre_n}"
+    if dev_n is not None:
+        result += f"-dev{dev_n}" if pre_l is None else f".dev{dev_n}"
+    if build is not None:
+        result += f"+{build}"
+    return result
+
+
+def _node_version_to_python(version: str) -> str:
+    # Plain releases are the same in both forms
+    if type(version) is str and _is_plain_release(version):
+        return version
+    return _format_python_version(_parse_node_version(version))
+
+
+def _python_version_to_node(version: str) -> str:
+    if type(version) is str and _is_plain_release(version):
+        return version
+    return _format_node_version(_parse_python_version(version))
+
+
+_LOCAL_SEPARATORS = re.compile(r"[-_.]")
+
+
+class NodeJSVersion:
+    """A parsed version, which renders both its Node.js and Python forms.
+
+    Versions are ordered (and compare equal) as PEP 440 orders the Python form,
+    according to the precomputed `sort_key`.
+    """
+
+    __slots__ = (
+        "major",
+        "minor",
+        "patch",
+        "pre_l",
+        "pre_n",
+        "dev_n",
+        "build",
+        "sort_key",
+    )
+
+    def __init__(
+        self,
+        major: str,
+        minor: str,
+        patch: str,
+        pre_l: str | None = None,
+        pre_n: str | None = None,
+        dev_n: str | None = None,
+        build: str | None = None,
+    ):
+        self.major = major
+        self.minor = minor
+        self.patch = patch
+        self.pre_l = pre_l
+        self.pre_n = pre_n
+        self.dev_n = dev_n
+        self.build = build
+
+        if pre_l is not None:
+            # The label's first letter identifies it: a[lpha], b[eta], or
+            # c/rc/pre[view] (which are all equivalent)
+            pre_rank = {"a": 1, "b": 2}.get(pre_l[0].lower(), 3)
+        elif dev_n is not None:
+            # A dev release precedes the pre-releases of the same version
+            pre_rank = 0
+        else:
+            pre_rank = 4
+
+        if build is None:
+            local: tuple = ()
+        else:
+            local = tuple(
+                (1, int(part), "") if part.isdigit() else (0, 0, part.lower())
+                for part in _LOCAL_SEPARATORS.split(build)
+            )
+
+        self.sort_key = (
+            int(major),
+            int(minor),
+            int(patch),
+            pre_rank,
+            int(pre_n or 0),
+            dev_n is None,
+            int(dev_n or 0),
+            local,
+        )
+
+    @classmethod
+    def from_node(cls, version: str) -> NodeJSVersion:
+        return cls(*_parse_node_version(version))
+
+    @classmethod
+    def from_python(cls, version: str) -> NodeJSVersion:
+        return cls(*_parse_python_version(version))
+
+    @property
+    def parts(self) -> VersionParts:
+        return (
+            self.major,
+            self.minor,
+            self.patch,
+            self.pre_l,
+            self.pre_n,
+            self.dev_n,
+            self.build,
+        )
+
+    @property
+    def node(self) -> str:
+        return _format_node_version(self.parts)
+
+    @property
+    def python(self) -> str:
+        return _format_python_version(self.parts)
+
+    def __repr__(self):
+        return f"{type(self).__name__}.from_node({self.node!r})"
+
+    def __hash__(self):
+        return hash(self.sort_key)
+
+    def __eq__(self, other):
+        if not isinstance(other, NodeJSVersion):
+            return NotImplemented
+        return self.sort_key == other.sort_key
+
+    def __lt__(self, other):
+        if not isinstance(other, NodeJSVersion):
+            return NotImplemented
+        return self.sort_key < other.sort_key
+
+    def __le__(self, other):
+        if not isinstance(other, NodeJSVersion):
+            return NotImplemented
+        return self.sort_key <= other.sort_key
+
+    def __gt__(self, other):
+        if not isinstance(other, NodeJSVersion):
+            return NotImplemented
+        return self.sort_key > other.sort_key
+
+    def __ge__(self, other):
+        if not isinstance(other, NodeJSVersion):
+            return NotImplemented
+        return self.sort_key >= other.sort_key
+
+
+@functools.lru_cache(maxsize=None)
+def _version_reader(loads: Callable[[Any], Any]) -> Callable[[str], Any]:
+    # One reader per JSON backend, so that cache entries are keyed by backend
+    def read_version(path: str) -> Any:
+        return read_member(path, "version", loads)
+
+    return read_version
+
+
+def _set_pointer(data: Any, pointer: str, value: Any):
+    *parents, last = parse_pointer(pointer)
+    try:
+        for token in parents:
+            data = data[int(token) if isinstance(data, list) else token]
+        if isinstance(data, list):
+            data[int(last)] = value
+        elif isinstance(data, dict):
+            data[last] = value
+        else:
+            raise TypeError
+    except (LookupError, TypeError, ValueError):
+        raise ValueError(f"JSON pointer {pointer!r} does not resolve") from None
+
+
+def _replace_version(raw_data: bytes, version: str, pointer: str = "/version") -> bytes:
+    """Return ``raw_data`` with the member referenced by the JSON pointer
+    ``pointer`` set to ``version``.
+
+    Only the bytes of the existing value are replaced, preserving the rest of
+    the document verbatim. Documents that cannot be scanned, or that have no
+    such member, are re-serialized instead.
+    """
+    try:
+        span = find_pointer(raw_data, pointer)
+    except ScanError:
+        span = None
+
+    if span is not None:
+        start, end = span
+        return b"".join(
+            (raw_data[:start], json.dumps(version).encode("utf-8"), raw_data[end:])
+        )
+
+    text = raw_data.decode("utf-8")
+    data = json.loads(text)
+    _set_pointer(data, pointer, version)
+    result = json.dumps(data, indent=4)
+    if text.endswith("\n"):
+        result += "\n"
+    return result.encode("utf-8")
+
+
+def conversion_cache_info() -> dict[str, LRUCacheInfo]:
+    """Statistics for the memos behind the version converters."""
+    return {
+        "node_to_python": _node_to_python_cache.cache_info(),
+        "python_to_node": _python_to_node_cache.cache_info(),
+    }
+
+
+def conversion_cache_clear():
+    _node_to_python_cache.cache_clear()
+    _python_to_node_cache.cache_clear()
+
+
+class VersionConflictError(RuntimeError):
+    """The version in ``package.json`` changed after it was read."""
+
 
 class NodeJSVersionSource(VersionSourceInterface):
     PLUGIN_NAME = "nodejs"
@@ -104,115 +525,177 @@ class NodeJSVersionSource(VersionSourceInterface):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        self.__path = None
+        self.__options = None
 
     @property
-    def path(self):
-        if self.__path is None:
-            version_file = self.config.get("path", "package.json")
-            if not isinstance(version_file, (str, bytes, os.PathLike)):
-                raise TypeError(
-                    "Option `path` for version source `{}` must be a string".format(
-                        self.PLUGIN_NAME
-                    )
-                )
+    def options(self) -> VersionSourceOptions:
+        """The validated options, which are shared with every version source of
+        an equal configuration.
+        """
+        if self.__options is None:
+            self.__options = VersionSourceOptions.from_config(
+                self.config, self.PLUGIN_NAME
+            )
+        return self.__options
 
-            self.__path = os.fspath(version_file)
+    @property
+    def path(self) -> str:
+        return self.options.path
 
-        return self.__path
+    @property
+    def targets(self) -> tuple[tuple[str, str], ...]:
+        """The ``(path, pointer)`` of each member to which `set_version` writes,
+        starting with the ``version`` of `path`.
+        """
+        return self.options.targets
 
-    @staticmethod
-    def node_version_to_python(version: str) -> str:
-        # NodeJS version strings are a near superset of Python version strings
-        match = re.match(
-            r"^\s*" + NODE_VERSION_PATTERN + r"\s*$",
-            version,
-            re.VERBOSE | re.IGNORECASE,
-        )
-        if match is None:
-            raise ValueError(f"Version {version!r} did not match regex")
-
-        groups = {}
-        for key, value in match.groupdict().items():
-            key = re.sub("pre_dev_|pre_only_|dev_only_", "", key)
-            if key not in groups:
-                groups[key] = value
-            elif value is not None:
-                groups[key] = value
-
-        del match
-        parts = ["{major}.{minor}.{patch}".format_map(groups)]
-
-        if groups["pre_only"] or groups["pre_dev"]:
-            if groups["pre_n"] is None:
-                parts.append("{pre_l}".format_map(groups))
-            else:
-                parts.append("{pre_l}{pre_n}".format_map(groups))
+    @property
+    def cache_dir(self) -> str | None:
+        return self.options.cache_dir
 
-        if groups["dev_only"] or groups["pre_dev"]:
-            if groups["dev_n"] is None:
-                parts.append("dev0")
-            else:
-                parts.append("dev{dev_n}".format_map(groups))
+    @property
+    def json_backend(self) -> str | None:
+        return self.options.json_backend
+
+    @property
+    def lock_timeout(self) -> float:
+        return self.options.lock_timeout
 
-        if groups["build"]:
-            parts.append("+{build}".format_map(groups))
+    @property
+    def trace_file(self) -> str | None:
+        return self.options.trace_file
+
+    @property
+    def _trace_path(self) -> str | None:
+        if self.trace_file is None:
+            return None
+        return os.path.join(self.root, self.trace_file)
 
-        return "".join(parts)
+    @staticmethod
+    def node_version_to_python(version: str) -> str:
+        return _node_to_python_cache.get_or_compute(version, _node_version_to_python)
 
     @staticmethod
     def python_version_to_node(version: str) -> str:
-        # NodeJS version strings are a near superset of Python version strings
-        match = re.match(
-            r"^\s*" + PYTHON_VERSION_PATTERN + r"\s*$",
-            version,
-            re.VERBOSE | re.IGNORECASE,
-        )
-        if match is None:
-            raise ValueError(f"Version {version!r} did not match regex")
+        return _python_to_node_cache.get_or_compute(version, _python_version_to_node)
 
-        parts = ["{major}.{minor}.{patch}".format_map(match)]
+    @staticmethod
+    def node_versions_to_python(versions: Iterable[str]) -> list[str]:
+        """Convert many Node.js versions to Python versions, in order."""
+        convert = _node_to_python_cache.get_or_compute
+        return [convert(v, _node_version_to_python) for v in versions]
 
-        if match["pre"]:
-            if match["pre_n"] is None:
-                parts.append("-{pre_l}".format_map(match))
-            else:
-                parts.append("-{pre_l}{pre_n}".format_map(match))
+    @staticmethod
+    def python_versions_to_node(versions: Iterable[str]) -> list[str]:
+        """Convert many Python versions to Node.js versions, in order."""
+        convert = _python_to_node_cache.get_or_compute
+        return [convert(v, _python_version_to_node) for v in versions]
 
-        if match["dev"]:
-            if match["pre"]:
-                parts.append(".dev{dev_n}".format_map(match))
-            else:
-                parts.append("-dev{dev_n}".format_map(match))
+    def get_version_data(self):
+        with trace.session("get_version_data", self.path, self._trace_path):
+            if self.cache_dir is not None:
+                return self._get_cached_version_data()
+
+            version = package_json_cache.get(
+                self.root, self.path, _version_reader(get_loads(self.json_backend))
+            )
+            with trace.span("convert"):
+                return {"version": self.node_version_to_python(version)}
 
-        if match["local"]:
-            parts.append("+{local}".format_map(match))
-        return "".join(parts)
+    async def aget_version_data(self):
+        """Equivalent to `get_version_data`, without blocking the event loop."""
+        from ._aio import run_blocking
 
-    def get_version_data(self):
-        path = os.path.normpath(os.path.join(self.root, self.path))
-        if not os.path.isfile(path):
-            raise OSError(f"file does not exist: {self.path}")
+        return await run_blocking(self.get_version_data)
+
+    def _get_cached_version_data(self):
+        from ._disk_cache import DiskCache
+
+        with trace.span("read") as s:
+            content = read_file(self.root, self.path)
+            s.read(len(content))
 
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        cache = DiskCache(os.path.join(self.root, self.cache_dir))
+        key = cache.key("version", content, self.config)
 
-        return {"version": self.node_version_to_python(data["version"])}
+        version_data = cache.load(key)
+        if version_data is None:
+            with trace.span("scan"):
+                version = loads_member(content, "version", get_loads(self.json_backend))
+            with trace.span("convert"):
+                version_data = {"version": self.node_version_to_python(version)}
+            cache.store(key, version_data)
+        return version_data
+
+    def _check_version(self, raw_data: bytes, version_data):
+        """Raise `VersionConflictError` unless the version in ``raw_data`` (the
+        contents of `path`) is that of ``version_data``.
+        """
+        expected = (version_data or {}).get("version")
+        if expected is None:
+            return
+
+        try:
+            version = loads_member(raw_data, "version", get_loads(self.json_backend))
+            current = self.node_version_to_python(version)
+        except (KeyError, TypeError, ValueError):
+            current = None
+        if current != expected:
+            raise VersionConflictError(
+                f"The version in {self.path} is {current!r}, not {expected!r} as "
+                "when it was read; it was changed by another writer"
+            )
 
     def set_version(self, version: str, version_data):
-        path = os.path.normpath(os.path.join(self.root, self.path))
-        if not os.path.isfile(path):
-            raise OSError(f"file does not exist: {self.path}")
-
-        # Read the original file so we can see if it has a trailing
-        # newline character.
-        with open(path, "r") as f:
-            raw_data = f.read()
-
-        data = json.loads(raw_data)
-
-        data["version"] = self.python_version_to_node(version)
-        with open(path, "w") as f:
-            json.dump(data, f, indent=4)
-            if raw_data.endswith("\n"):
-                f.write("\n")
+        # Each file is read once, and all of its members replaced
+        files: dict[str, list[str]] = {}
+        for path, pointer in self.targets:
+            files.setdefault(path, []).append(pointer)
+        # Symlinked files are written through, rather than replaced by the link
+        resolved = {
+            path: os.path.realpath(os.path.join(self.root, path)) for path in files
+        }
+        # Concurrent writers are serialised, and the version is only written if
+        # it is still the one that the caller read
+        lock = lock_directories(
+            {os.path.dirname(path) for path in resolved.values()}, self.lock_timeout
+        )
+
+        with trace.session("set_version", self.path, self._trace_path):
+            with contextlib.ExitStack() as stack:
+                with trace.span("lock"):
+                    stack.enter_context(lock)
+
+                with trace.span("read") as s:
+                    raw_files = {path: read_file(self.root, path) for path in files}
+                    s.read(sum(map(len, raw_files.values())))
+
+                with trace.span("convert"):
+                    self._check_version(raw_files[self.targets[0][0]], version_data)
+                    node_version = self.python_version_to_node(version)
+
+                writes = []
+                with trace.span("scan"):
+                    for path, raw_data in raw_files.items():
+                        new_data = raw_data
+                        for pointer in files[path]:
+                            new_data = _replace_version(new_data, node_version, pointer)
+
+                        # Leave the file (and its mtime) untouched if nothing changed
+                        if new_data != raw_data:
+                            writes.append((resolved[path], new_data, raw_data))
+
+                if writes:
+                    with trace.span("write") as s:
+                        try:
+                            atomic_write_many(writes)
+                        finally:
+                            for path in files:
+                                package_json_cache.invalidate(self.root, path)
+                        s.wrote(sum(len(data) for _, data, _ in writes))
+
+    async def aset_version(self, version: str, version_data):
+        """Equivalent to `set_version`, without blocking the event loop."""
+        from ._aio import run_blocking
+
+        await run_blocking(self.set_version, version, version_data)
@@ -0,0 +1,165 @@
+# SPDX-FileCopyrightText: 2022-present Angus Hollands <goosey15@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""Keep a derived Python version in sync with ``package.json`` during development.
+
+`VersionWatcher` polls the ``package.json`` of a project, and pushes the Python
+version to a callback and/or a ``_version.py`` file whenever it changes::
+
+    python -m hatch_nodejs_version.watch --target my_app/_version.py
+
+Each poll is a single ``stat`` call; the file is only read (and the version
+only re-derived) once its size, modification time or inode has changed, and
+then stayed unchanged for the debounce period, so that a burst of writes
+results in a single update.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any, Callable
+
+from ._io import atomic_write
+from .version_source import NodeJSVersionSource
+
+VERSION_FILE_TEMPLATE = """\
+# This file is generated from package.json by hatch-nodejs-version
+__version__ = {version!r}
+"""
+
+
+def _signature(path: str) -> tuple[int, int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+class VersionWatcher:
+    """Watch the version of the project at ``root``.
+
+    ``config`` is the configuration of the `NodeJSVersionSource`. When the
+    Python version changes, it is passed to ``callback``, and written to the
+    ``target`` file (relative to ``root``). Errors deriving the version, e.g.
+    from a half-written ``package.json``, are passed to ``on_error``, and the
+    file continues to be watched.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        config: dict[str, Any] | None = None,
+        *,
+        callback: Callable[[str], None] | None = None,
+        target: str | None = None,
+        on_error: Callable[[Exception], None] | None = None,
+        interval: float = 0.5,
+        debounce: float = 0.1,
+    ):
+        self.source = NodeJSVersionSource(root, {} if config is None else config)
+        self.callback = callback
+        self.target = target
+        self.on_error = on_error
+        self.interval = interval
+        self.debounce = debounce
+        self.version: str | None = None
+
+        self._path = os.path.join(root, self.source.path)
+        self._signature: tuple[int, int, int] | None = None
+        self._pending: tuple[int, int, int] | None = None
+        self._changed_at = 0.0
+        self._stopped = threading.Event()
+
+    def poll_once(self) -> str | None:
+        """Check ``package.json`` for changes, returning the new Python version
+        if it changed (and was pushed), or `None`.
+        """
+        signature = _signature(self._path)
+        now = time.monotonic()
+        if signature != self._pending:
+            # Restart the debounce period on every change
+            self._pending = signature
+            self._changed_at = now
+        if self._pending == self._signature or now - self._changed_at < self.debounce:
+            return None
+
+        self._signature = self._pending
+        if signature is None:
+            return None
+
+        try:
+            version = self.source.get_version_data()["version"]
+        except Exception as error:
+            if self.on_error is not None:
+                self.on_error(error)
+            return None
+
+        if version == self.version:
+            return None
+        self.version = version
+        self._push(version)
+        return version
+
+    def _push(self, version: str):
+        if self.target is not None:
+            path = os.path.join(self.source.root, self.target)
+            content = VERSION_FILE_TEMPLATE.format(version=version).encode("utf-8")
+            atomic_write(path, content)
+        if self.callback is not None:
+            self.callback(version)
+
+    def run(self):
+        """Poll until `stop` is called."""
+        while not self._stopped.is_set():
+            self.poll_once()
+            timeout = self.interval
+            if self._pending != self._signature:
+                # Wake up as soon as a pending change has settled
+                remaining = self._changed_at + self.debounce - time.monotonic()
+                timeout = min(timeout, max(remaining, 0.0))
+            self._stopped.wait(timeout)
+
+    def stop(self):
+        self._stopped.set()
+
+
+def main(argv: list[str] | None = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m hatch_nodejs_version.watch",
+        description="Write the Python version of package.json to a file whenever "
+        "it changes.",
+    )
+    parser.add_argument("--root", default=".", help="project directory")
+    parser.add_argument(
+        "--path", default="package.json", help="path of package.json within root"
+    )
+    parser.add_argument(
+        "--target", help="path of the version file within root, e.g. _version.py"
+    )
+    parser.add_argument("--interval", type=float, default=0.5)
+    parser.add_argument("--debounce", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    import sys
+
+    watcher = VersionWatcher(
+        args.root,
+        {"path": args.path},
+        callback=print,
+        target=args.target,
+        on_error=lambda error: print(f"error: {error}", file=sys.stderr),
+        interval=args.interval,
+        debounce=args.debounce,
+    )
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
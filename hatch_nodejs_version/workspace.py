@@ -0,0 +1,115 @@
+# SPDX-FileCopyrightText: 2022-present Angus Hollands <goosey15@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import glob
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, NamedTuple
+
+from .cache import package_json_cache
+from .metadata_source import NodeJSMetadataHook
+from .version_source import NodeJSVersionSource
+
+
+class WorkspaceMember(NamedTuple):
+    version: str
+    metadata: dict[str, Any]
+
+
+class WorkspaceResolution(NamedTuple):
+    members: dict[str, WorkspaceMember]
+    errors: dict[str, Exception]
+
+
+def find_workspace_members(root: str, path: str = "package.json") -> list[str]:
+    """Return the member directories of the npm workspace rooted at ``root``,
+    relative to ``root`` and using forward slashes.
+
+    Members are matched by the ``workspaces`` globs of the root ``package.json``
+    (given either as a list or as the ``packages`` of an object). Patterns
+    prefixed with ``!`` exclude directories. Only directories that contain a
+    ``package.json`` are members.
+    """
+    package = package_json_cache.load(root, path)
+    workspaces = package.get("workspaces", [])
+    if isinstance(workspaces, dict):
+        workspaces = workspaces.get("packages", [])
+    if not (
+        isinstance(workspaces, list) and all(isinstance(w, str) for w in workspaces)
+    ):
+        raise TypeError("Field `workspaces` must be a list of strings")
+
+    root = os.fspath(root)
+    members: set[str] = set()
+    for pattern in workspaces:
+        exclude = pattern.startswith("!")
+        if exclude:
+            pattern = pattern[1:]
+
+        matches = set()
+        for match in glob.glob(
+            os.path.join(glob.escape(root), pattern), recursive=True
+        ):
+            if os.path.isfile(os.path.join(match, "package.json")):
+                matches.add(os.path.relpath(match, root).replace(os.sep, "/"))
+
+        if exclude:
+            members -= matches
+        else:
+            members |= matches
+    return sorted(members)
+
+
+def _resolve_member(
+    root: str, version_config: dict, metadata_config: dict
+) -> WorkspaceMember:
+    version_data = NodeJSVersionSource(root, config=version_config).get_version_data()
+    metadata: dict[str, Any] = {}
+    NodeJSMetadataHook(root, config=metadata_config).update(metadata)
+    return WorkspaceMember(version_data["version"], metadata)
+
+
+def resolve_workspace(
+    root: str,
+    path: str = "package.json",
+    *,
+    version_config: dict | None = None,
+    metadata_config: dict | None = None,
+    max_workers: int | None = None,
+) -> WorkspaceResolution:
+    """Resolve the Python version and PEP 621 metadata of every workspace member.
+
+    Members are resolved concurrently on a thread pool of ``max_workers``
+    threads, with ``version_config`` and ``metadata_config`` used as the
+    configuration of the version source and metadata hook of every member.
+    Errors are collected per member rather than aborting the resolution. Both
+    mappings are keyed by the member directory relative to ``root``.
+    """
+    version_config = {} if version_config is None else version_config
+    metadata_config = {} if metadata_config is None else metadata_config
+
+    names = find_workspace_members(root, path)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            name: executor.submit(
+                _resolve_member,
+                os.path.join(root, name),
+                version_config,
+                metadata_config,
+            )
+            for name in names
+        }
+
+    members = {}
+    errors = {}
+    for name, future in futures.items():
+        error = future.exception()
+        if error is None:
+            members[name] = future.result()
+        elif isinstance(error, Exception):
+            errors[name] = error
+        else:
+            raise error
+    return WorkspaceResolution(members, errors)
@@ -3,6 +3,7 @@
 #
 # SPDX-License-Identifier: MIT
 import errno
+import json
 import os
 import pathlib
 import shutil
@@ -23,6 +24,12 @@ def create_file(path, contents):
         f.write(contents)
 
 
+def create_package(directory, **contents):
+    directory.mkdir(parents=True, exist_ok=True)
+    create_file(directory / "package.json", json.dumps(contents))
+    return directory
+
+
 @contextmanager
 def create_project(directory):
     project_dir = directory / "my-app"
@@ -67,3 +74,11 @@ def temp_dir():
 def project(temp_dir):
     with create_project(temp_dir) as project:
         yield project
+
+
+@pytest.fixture
+def write_package():
+    """Write a ``package.json`` with the given members to a directory, creating
+    the directory if needed.
+    """
+    return create_package
@@ -0,0 +1,124 @@
+# SPDX-FileCopyrightText: 2022-present Angus Hollands <goosey15@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from hatch_nodejs_version import _aio
+from hatch_nodejs_version.metadata_source import NodeJSMetadataHook
+from hatch_nodejs_version.version_source import NodeJSVersionSource
+
+
+@pytest.fixture
+def projects(temp_dir, write_package):
+    roots = []
+    for i in range(50):
+        root = temp_dir / f"project-{i}"
+        write_package(
+            root,
+            name=f"project-{i}",
+            version=f"1.{i}.0-rc{i}",
+            description=f"Project {i}",
+            author="Alice Roberts <alice@example.com>",
+            homepage="https://example.com",
+        )
+        roots.append(str(root))
+    return roots
+
+
+class TestAsync:
+    def test_version_data(self, projects):
+        async def main():
+            return await asyncio.gather(
+                *(
+                    NodeJSVersionSource(root, {}).aget_version_data()
+                    for root in projects
+                )
+            )
+
+        assert asyncio.run(main()) == [
+            NodeJSVersionSource(root, {}).get_version_data() for root in projects
+        ]
+
+    def test_set_version(self, projects):
+        async def main():
+            await asyncio.gather(
+                *(
+                    NodeJSVersionSource(root, {}).aset_version("2.0.0b1", {})
+                    for root in projects
+                )
+            )
+
+        asyncio.run(main())
+        for root in projects:
+            with open(f"{root}/package.json") as f:
+                assert json.load(f)["version"] == "2.0.0-b1"
+
+    def test_metadata(self, projects):
+        config = {"fields": ["description", "authors", "urls"]}
+
+        async def update(root):
+            metadata = {}
+            await NodeJSMetadataHook(root, config).aupdate(metadata)
+            return metadata
+
+        async def main():
+            return await asyncio.gather(*(update(root) for root in projects))
+
+        expected = []
+        for root in projects:
+            metadata = {}
+            NodeJSMetadataHook(root, config).update(metadata)
+            expected.append(metadata)
+        assert asyncio.run(main()) == expected
+
+    def test_load_package_data(self, projects):
+        hook = NodeJSMetadataHook(projects[0], {})
+        assert asyncio.run(hook.aload_package_data()) == hook.load_package_data()
+
+    def test_error(self, temp_dir):
+        source = NodeJSVersionSource(str(temp_dir), {})
+        with pytest.raises(OSError, match="file does not exist: package.json"):
+            asyncio.run(source.aget_version_data())
+
+    def test_concurrency_limit(self, monkeypatch):
+        monkeypatch.setattr(_aio, "MAX_CONCURRENCY", 3)
+        lock = threading.Lock()
+        running = 0
+        peak = 0
+
+        def work():
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.01)
+            with lock:
+                running -= 1
+
+        async def main():
+            await asyncio.gather(*(_aio.run_blocking(work) for _ in range(12)))
+
+        asyncio.run(main())
+        assert peak == 3
+
+    def test_loop_not_blocked(self):
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.005)
+                ticks += 1
+
+        async def main():
+            ticker = asyncio.ensure_future(tick())
+            await _aio.run_blocking(time.sleep, 0.1)
+            ticker.cancel()
+
+        asyncio.run(main())
+        assert ticks > 1
@@ -0,0 +1,160 @@
+# SPDX-FileCopyrightText: 2022-present Angus Hollands <goosey15@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from hatch_nodejs_version.cache import LRUCache, PackageJSONCache, package_json_cache
+from hatch_nodejs_version.metadata_source import NodeJSMetadataHook
+from hatch_nodejs_version.version_source import NodeJSVersionSource
+
+PACKAGE_CONTENTS = """
+{
+  "name": "my-app",
+  "version": "1.0.0"
+}
+"""
+
+
+@pytest.fixture
+def cache():
+    cache = PackageJSONCache()
+    yield cache
+    cache.cache_clear()
+
+
+class TestPackageJSONCache:
+    def test_hit_and_miss(self, project, cache):
+        (project / "package.json").write_text(PACKAGE_CONTENTS)
+
+        first = cache.load(project, "package.json")
+        second = cache.load(project, "package.json")
+
+        assert first is second
+        assert cache.cache_info() == (1, 1, 1)
+
+    def test_stale_entry_is_dropped(self, project, cache):
+        package_json = project / "package.json"
+        package_json.write_text(PACKAGE_CONTENTS)
+        assert cache.load(project, "package.json")["version"] == "1.0.0"
+
+        package_json.write_text(PACKAGE_CONTENTS.replace("1.0.0", "10.0.0"))
+        assert cache.load(project, "package.json")["version"] == "10.0.0"
+        assert cache.cache_info() == (0, 2, 1)
+
+    def test_stale_entry_same_size(self, project, cache):
+        package_json = project / "package.json"
+        package_json.write_text(PACKAGE_CONTENTS)
+        assert cache.load(project, "package.json")["version"] == "1.0.0"
+
+        package_json.write_text(PACKAGE_CONTENTS.replace("1.0.0", "2.0.0"))
+        stat = package_json.stat()
+        os.utime(package_json, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert cache.load(project, "package.json")["version"] == "2.0.0"
+
+    def test_missing_file(self, project, cache):
+        with pytest.raises(OSError, match="file does not exist: package.json"):
+            cache.load(project, "package.json")
+
+    def test_shared_between_plugins(self, project):
+        (project / "package.json").write_text(PACKAGE_CONTENTS)
+        package_json_cache.cache_clear()
+
+        for _ in range(2):
+            NodeJSVersionSource(project, config={}).get_version_data()
+            NodeJSMetadataHook(project, config={}).update({})
+
+        assert package_json_cache.cache_info() == (2, 2, 1)
+
+
+class TestLRUCache:
+    def test_eviction(self):
+        cache = LRUCache(maxsize=2)
+        calls = []
+
+        def compute(key):
+            calls.append(key)
+            return key.upper()
+
+        assert cache.get_or_compute("a", compute) == "A"
+        assert cache.get_or_compute("b", compute) == "B"
+        assert cache.get_or_compute("a", compute) == "A"
+        # "b" is now least recently used
+        assert cache.get_or_compute("c", compute) == "C"
+        assert cache.get_or_compute("a", compute) == "A"
+        assert cache.get_or_compute("b", compute) == "B"
+
+        assert calls == ["a", "b", "c", "b"]
+        assert cache.cache_info() == (2, 4, 2, 2, 2)
+
+    def test_errors_not_cached(self):
+        cache = LRUCache(maxsize=2)
+
+        def compute(key):
+            raise ValueError(key)
+
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                cache.get_or_compute("a", compute)
+        assert cache.cache_info() == (0, 2, 0, 2, 0)
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            LRUCache(maxsize=0)
+
+    def test_sharded(self):
+        cache = LRUCache(maxsize=1000)
+        for i in range(5000):
+            cache.get_or_compute(i, str)
+
+        # Each shard is bounded, so the cache as a whole is too
+        assert cache.cache_info() == (0, 5000, 4000, 1000, 1000)
+
+    def test_threads(self):
+        # Switch threads often, for builds that have a GIL
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            cache = LRUCache(maxsize=512)
+            barrier = threading.Barrier(8)
+
+            def work(offset):
+                barrier.wait()
+                for i in range(20_000):
+                    key = (i * 7 + offset) % 1024
+                    assert cache.get_or_compute(key, str) == str(key)
+
+            with ThreadPoolExecutor(8) as executor:
+                list(executor.map(work, range(8)))
+        finally:
+            sys.setswitchinterval(interval)
+
+        info = cache.cache_info()
+        assert info.hits + info.misses == 8 * 20_000
+        assert info.currsize == 512
+
+
+class TestThreads:
+    def test_plugins_shared_between_threads(self, project):
+        (project / "package.json").write_text(PACKAGE_CONTENTS)
+        version_source = NodeJSVersionSource(project, config={})
+        metadata_hook = NodeJSMetadataHook(project, config={})
+        barrier = threading.Barrier(8)
+
+        def work(_):
+            # Every thread races to initialise the options of the same plugins
+            barrier.wait()
+            results = []
+            for _ in range(100):
+                metadata = {}
+                metadata_hook.update(metadata)
+                results.append((version_source.get_version_data(), metadata))
+            return results
+
+        with ThreadPoolExecutor(8) as executor:
+            results = [r for rs in executor.map(work, range(8)) for r in rs]
+        assert results == [({"version": "1.0.0"}, {"name": "my-app"})] * 800
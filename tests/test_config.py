@@ -0,0 +1,71 @@
+# SPDX-FileCopyrightText: 2022-present Angus Hollands <goosey15@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+import pytest
+
+from hatch_nodejs_version._config import ConfigurationError, MetadataHookOptions
+from hatch_nodejs_version.metadata_source import NodeJSMetadataHook
+from hatch_nodejs_version.version_source import NodeJSVersionSource
+
+
+class TestOptions:
+    def test_all_errors_reported(self, project):
+        config = {"path": 1, "fields": "name", "json-backend": "simdjson"}
+        with pytest.raises(ConfigurationError) as excinfo:
+            NodeJSMetadataHook(project, config).options
+
+        assert [type(e) for e in excinfo.value.errors] == [
+            TypeError,
+            TypeError,
+            ValueError,
+        ]
+        assert str(excinfo.value).splitlines() == [
+            "Option `path` for metadata hook `nodejs` must be a string",
+            "Option `fields` for metadata hook `nodejs` must be a list of strings",
+            "Option `json-backend` for metadata hook `nodejs` must be one of "
+            "auto, json, orjson",
+        ]
+
+    def test_all_targets_reported(self, project):
+        config = {
+            "targets": [1, {"path": "a.json", "pointer": "x"}],
+            "lock-timeout": -1,
+        }
+        with pytest.raises(ConfigurationError) as excinfo:
+            NodeJSVersionSource(project, config).options
+
+        assert [str(e) for e in excinfo.value.errors] == [
+            "Option `targets` for version source `nodejs` must contain strings, or "
+            "tables with a string `path` and an optional string `pointer`",
+            "Invalid JSON pointer: 'x'",
+            "Option `lock-timeout` for version source `nodejs` must not be negative",
+        ]
+
+    @pytest.mark.parametrize("plugin", [NodeJSVersionSource, NodeJSMetadataHook])
+    def test_shared_between_instances(self, project, plugin):
+        config = {"path": "package.json", "cache-dir": "build"}
+        first = plugin(project, config)
+        second = plugin(project, dict(reversed(config.items())))
+
+        assert first.options is second.options
+        assert plugin(project, {}).options is not first.options
+
+    def test_snapshot_distinguishes_types(self, project):
+        assert NodeJSVersionSource(project, {"lock-timeout": 1}).lock_timeout == 1
+        with pytest.raises(TypeError, match="Option `lock-timeout`"):
+            NodeJSVersionSource(project, {"lock-timeout": True}).lock_timeout
+
+    def test_unhashable_config(self, project):
+        with pytest.raises(TypeError, match="Option `fields`"):
+            NodeJSMetadataHook(project, {"fields": {"name"}}).fields
+
+    def test_immutable(self, project):
+        options = NodeJSMetadataHook(project, {"fields": ["name"]}).options
+        assert isinstance(options, MetadataHookOptions)
+        assert options.fields == {"name"}
+
+        with pytest.raises(AttributeError):
+            options.path = "other.json"
+        with pytest.raises(AttributeError):
+            options.extra = 1
+        assert options.path == "package.json"
@@ -0,0 +1,114 @@
+# SPDX-FileCopyrightText: 2022-present Angus Hollands <goosey15@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+import json
+import os
+
+import pytest
+
+from hatch_nodejs_version import version_source
+from hatch_nodejs_version._disk_cache import DiskCache
+from hatch_nodejs_version.metadata_source import NodeJSMetadataHook
+from hatch_nodejs_version.version_source import NodeJSVersionSource
+
+PACKAGE_CONTENTS = {
+    "name": "my-app",
+    "version": "1.0.0-rc1",
+    "description": "A terrible package",
+    "author": "Alice Roberts <alice.roberts@bbc.lol>",
+}
+
+CACHE_DIR = "build/nodejs-cache"
+
+
+@pytest.fixture
+def package_json(project):
+    path = project / "package.json"
+    path.write_text(json.dumps(PACKAGE_CONTENTS))
+    return path
+
+
+def fail(*args, **kwargs):
+    raise AssertionError("cache was not used")
+
+
+class TestDiskCache:
+    def test_version_reused(self, project, package_json, monkeypatch):
+        config = {"cache-dir": CACHE_DIR}
+        data = NodeJSVersionSource(project, config=config).get_version_data()
+        assert data == {"version": "1.0.0rc1"}
+        assert len(os.listdir(project / CACHE_DIR)) == 1
+
+        monkeypatch.setattr(version_source, "loads_member", fail)
+        assert NodeJSVersionSource(project, config=config).get_version_data() == data
+
+    def test_metadata_reused(self, project, package_json, monkeypatch):
+        config = {"cache-dir": CACHE_DIR, "fields": ["description", "authors"]}
+        expected = {
+            "description": "A terrible package",
+            "authors": [{"name": "Alice Roberts", "email": "alice.roberts@bbc.lol"}],
+        }
+        metadata = {}
+        NodeJSMetadataHook(project, config=config).update(metadata)
+        assert metadata == expected
+
+        monkeypatch.setattr(NodeJSMetadataHook, "_project", fail)
+        metadata = {}
+        NodeJSMetadataHook(project, config=config).update(metadata)
+        assert metadata == expected
+
+        # A different configuration is a different entry
+        with pytest.raises(AssertionError, match="cache was not used"):
+            NodeJSMetadataHook(project, config={**config, "fields": ["name"]}).update(
+                {}
+            )
+
+    def test_content_change(self, project, package_json):
+        config = {"cache-dir": CACHE_DIR}
+        NodeJSVersionSource(project, config=config).get_version_data()
+
+        package_json.write_text(json.dumps({**PACKAGE_CONTENTS, "version": "2.0.0"}))
+        data = NodeJSVersionSource(project, config=config).get_version_data()
+        assert data == {"version": "2.0.0"}
+
+    def test_corrupt_entry(self, temp_dir):
+        cache = DiskCache(temp_dir)
+        key = cache.key("version", b"{}", {})
+        (temp_dir / f"nodejs-{key}.json").write_text("{")
+        assert cache.load(key) is None
+
+        cache.store(key, {"version": "1.0.0"})
+        assert cache.load(key) == {"version": "1.0.0"}
+
+    def test_eviction(self, temp_dir):
+        cache = DiskCache(temp_dir, max_entries=2)
+        keys = [cache.key("version", str(i).encode(), {}) for i in range(3)]
+        for i, key in enumerate(keys):
+            cache.store(key, i)
+            path = temp_dir / f"nodejs-{key}.json"
+            os.utime(path, ns=(i * 10**9, i * 10**9))
+
+        cache.store(keys[2], 2)
+        assert cache.load(keys[0]) is None
+        assert [cache.load(k) for k in keys[1:]] == [1, 2]
+
+    def test_eviction_spares_other_files(self, temp_dir):
+        # The cache directory may be shared, e.g. with other build outputs
+        others = ["package.json", "0123.json", f"{'0' * 64}.json"]
+        for i, name in enumerate(others):
+            (temp_dir / name).write_text("{}")
+            os.utime(temp_dir / name, ns=(i, i))
+
+        cache = DiskCache(temp_dir, max_entries=1)
+        for i in range(3):
+            cache.store(cache.key("version", str(i).encode(), {}), i)
+
+        names = sorted(os.listdir(temp_dir))
+        assert [name for name in names if name not in others] == [
+            f"nodejs-{cache.key('version', b'2', {})}.json"
+        ]
+        assert set(others) <= set(names)
+
+    def test_invalid_option(self, project, package_json):
+        with pytest.raises(TypeError, match="Option `cache-dir`"):
+            NodeJSVersionSource(project, config={"cache-dir": 1}).get_version_data()
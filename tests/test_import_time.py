@@ -0,0 +1,69 @@
+# SPDX-FileCopyrightText: 2022-present Angus Hollands <goosey15@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+import re
+import subprocess
+import sys
+
+# Upper bound on the time taken to import the plugin modules, excluding
+# hatchling itself, in microseconds. This is deliberately generous to tolerate
+# slow CI runners, but fails if e.g. a heavy dependency is imported eagerly
+IMPORT_TIME_BUDGET_US = 100_000
+
+HATCHLING_MODULES = (
+    "hatchling.plugin",
+    "hatchling.version.source.plugin.interface",
+    "hatchling.metadata.plugin.interface",
+)
+PLUGIN_MODULES = (
+    "hatch_nodejs_version.hooks",
+    "hatch_nodejs_version.version_source",
+    "hatch_nodejs_version.metadata_source",
+)
+
+
+def run_python(code, *args):
+    return subprocess.run(
+        [sys.executable, *args, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def measure_import_time():
+    # Import hatchling first, so that only the cost of the plugin is measured
+    code = f"import {', '.join(HATCHLING_MODULES)}; import {', '.join(PLUGIN_MODULES)}"
+    stderr = run_python(code, "-X", "importtime").stderr
+
+    total = 0
+    for line in stderr.splitlines():
+        match = re.match(r"import time:\s*(\d+) \|\s*(\d+) \| (\S+)$", line)
+        # Top-level (unindented) plugin imports include everything they pull in
+        if match is not None and match[3] in PLUGIN_MODULES:
+            total += int(match[2])
+    return total
+
+
+class TestImportTime:
+    def test_hooks_are_lazy(self):
+        code = (
+            "import sys, hatch_nodejs_version.hooks; "
+            "print(sorted(m for m in sys.modules if m.startswith('hatch_nodejs')))"
+        )
+        modules = run_python(code).stdout.strip()
+        assert modules == str(
+            [
+                "hatch_nodejs_version",
+                "hatch_nodejs_version._version",
+                "hatch_nodejs_version.hooks",
+            ]
+        )
+
+    def test_import_time_budget(self):
+        # Take the best of several runs to reduce noise
+        import_time = min(measure_import_time() for _ in range(5))
+        assert import_time <= IMPORT_TIME_BUDGET_US, (
+            f"importing the plugin took {import_time}us, "
+            f"exceeding the budget of {IMPORT_TIME_BUDGET_US}us"
+        )
@@ -0,0 +1,97 @@
+# SPDX-FileCopyrightText: 2022-present Angus Hollands <goosey15@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+import json
+import math
+import sys
+
+import pytest
+
+from hatch_nodejs_version import _json
+from hatch_nodejs_version._json import JSON_BACKEND_ENV_VAR, get_loads, loads_json
+from hatch_nodejs_version.metadata_source import NodeJSMetadataHook
+from hatch_nodejs_version.version_source import NodeJSVersionSource
+
+DOCUMENTS = [
+    b'{"name": "my-app", "version": "1.2.3"}',
+    b'{"a": [1, -2.5e3, true, false, null, {"b": "\\u00e9\\n"}]}',
+    '{"name": "café"}'.encode(),
+    # Valid only to the standard library
+    b'{"a": NaN, "b": -Infinity}',
+    b'{"a": 1e400}',
+    b'{"a": "\\ud800"}',
+    b'{"a": 123456789012345678901234567890}',
+    b'{"a": -9223372036854775809}',
+    # Invalid
+    b"",
+    b'{"a": 1} x',
+    b'{"a": "\x01"}',
+    b'{"a": "\xff"}',
+    b'\xef\xbb\xbf{"a": 1}',
+    b'{"a": }',
+]
+
+
+def outcome(loads, data):
+    try:
+        result = loads(data)
+    except ValueError as error:
+        return type(error), str(error)
+    return json.dumps(result)
+
+
+@pytest.fixture
+def no_orjson(monkeypatch):
+    monkeypatch.setattr(_json, "_orjson", None)
+    monkeypatch.setitem(sys.modules, "orjson", None)
+
+
+class TestBackends:
+    @pytest.mark.parametrize("data", DOCUMENTS)
+    def test_orjson_matches_json(self, data):
+        pytest.importorskip("orjson")
+        assert outcome(get_loads("orjson"), data) == outcome(loads_json, data)
+
+    def test_orjson_large_integers(self):
+        pytest.importorskip("orjson")
+        result = get_loads("orjson")(b'{"a": 123456789012345678901234567890}')
+        assert result == {"a": 123456789012345678901234567890}
+        assert math.isnan(get_loads("orjson")(b"[NaN]")[0])
+
+    def test_select(self, monkeypatch):
+        monkeypatch.delenv(JSON_BACKEND_ENV_VAR, raising=False)
+        assert get_loads("json") is loads_json
+
+        monkeypatch.setenv(JSON_BACKEND_ENV_VAR, "json")
+        assert get_loads() is loads_json
+        assert get_loads("auto") is not None
+
+        monkeypatch.setenv(JSON_BACKEND_ENV_VAR, "simdjson")
+        with pytest.raises(ValueError, match="Unknown JSON backend 'simdjson'"):
+            get_loads()
+
+    def test_missing_orjson(self, no_orjson):
+        assert get_loads("auto") is loads_json
+        with pytest.raises(ImportError, match="requires the orjson package"):
+            get_loads("orjson")
+
+    @pytest.mark.parametrize("backend", ["json", "auto"])
+    def test_plugins(self, project, backend):
+        (project / "package.json").write_text(
+            '{"name": "my-app", "version": "1.2.3-rc0", "description": "An app"}'
+        )
+        config = {"json-backend": backend}
+
+        assert NodeJSVersionSource(project, config).get_version_data() == {
+            "version": "1.2.3rc0"
+        }
+        metadata = {}
+        NodeJSMetadataHook(project, config).update(metadata)
+        assert metadata == {"name": "my-app", "description": "An app"}
+
+    @pytest.mark.parametrize("plugin", [NodeJSVersionSource, NodeJSMetadataHook])
+    def test_invalid_option(self, project, plugin):
+        with pytest.raises(TypeError, match="Option `json-backend`"):
+            plugin(project, {"json-backend": 1}).json_backend
+        with pytest.raises(ValueError, match="must be one of auto, json, orjson"):
+            plugin(project, {"json-backend": "simdjson"}).json_backend
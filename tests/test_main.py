@@ -0,0 +1,79 @@
+# SPDX-FileCopyrightText: 2022-present Angus Hollands <goosey15@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+import io
+import json
+import subprocess
+import sys
+
+import pytest
+
+from hatch_nodejs_version.__main__ import convert_stream, main
+
+
+def convert(data, **kwargs):
+    out = io.BytesIO()
+    err = io.StringIO()
+    invalid = convert_stream(io.BytesIO(data), out, err, **kwargs)
+    return out.getvalue(), err.getvalue(), invalid
+
+
+class TestMain:
+    def test_to_python(self):
+        out, err, invalid = convert(b"1.2.3-rc0\r\n1.4\n\n1.0.0-dev1+build.1\n")
+        assert out == b"1.2.3rc0\n1.0.0dev1+build.1\n"
+        assert err == "<stdin>:2: Version '1.4' did not match regex\n"
+        assert invalid == 1
+
+    def test_to_node(self):
+        out, err, invalid = convert(b"1.2.3rc0\n1.2.3rc0\n1.0.0", to_node=True)
+        assert out == b"1.2.3-rc0\n1.2.3-rc0\n1.0.0\n"
+        assert (err, invalid) == ("", 0)
+
+    def test_null(self, monkeypatch):
+        # Records span chunk boundaries
+        monkeypatch.setattr("hatch_nodejs_version.__main__.CHUNK_SIZE", 4)
+        out, err, invalid = convert(b"1.2.3-rc0\x00bad\n\x001.2.3-b1", separator=b"\0")
+        assert out == b"1.2.3rc0\x001.2.3b1\x00"
+        assert err == "<stdin>:2: Version 'bad\\n' did not match regex\n"
+        assert invalid == 1
+
+    def test_jsonl(self):
+        out, _, _ = convert(b"1.2.3-rc0\n", jsonl=True)
+        assert [json.loads(line) for line in out.splitlines()] == [
+            {"node": "1.2.3-rc0", "python": "1.2.3rc0"}
+        ]
+
+        out, _, _ = convert(b"1.2.3rc0\n", jsonl=True, to_node=True)
+        assert json.loads(out) == {"python": "1.2.3rc0", "node": "1.2.3-rc0"}
+
+    def test_invalid_utf8(self):
+        out, err, invalid = convert(b"\xff\n1.0.0\n")
+        assert out == b"1.0.0\n"
+        assert err.startswith("<stdin>:1: 'utf-8' codec can't decode")
+        assert invalid == 1
+
+    def test_files(self, temp_dir, capsysbinary):
+        (temp_dir / "a.txt").write_text("1.0.0-a1\n")
+        (temp_dir / "b.txt").write_text("2.0\n2.0.0\n")
+
+        assert main([str(temp_dir / "a.txt"), str(temp_dir / "b.txt")]) == 1
+        captured = capsysbinary.readouterr()
+        assert captured.out == b"1.0.0a1\n2.0.0\n"
+        assert captured.err.decode().endswith(
+            "b.txt:1: Version '2.0' did not match regex\n"
+        )
+
+    def test_missing_file(self, temp_dir):
+        with pytest.raises(SystemExit) as excinfo:
+            main([str(temp_dir / "missing.txt")])
+        assert excinfo.value.code == 2
+
+    def test_stdin(self):
+        result = subprocess.run(
+            [sys.executable, "-m", "hatch_nodejs_version", "--to-node"],
+            input=b"1.2.3b1\n",
+            capture_output=True,
+        )
+        assert result.returncode == 0
+        assert result.stdout == b"1.2.3-b1\n"
@@ -2,6 +2,7 @@
 #
 # SPDX-License-Identifier: MIT
 import json
+import os
 
 import pytest
 
@@ -147,6 +148,22 @@ class TestMetadata:
             + TRIVIAL_EXPECTED_METADATA["maintainers"]
         )
 
+    def test_contributors_as_authors_without_author(self, project):
+        (project / "package.json").write_text(
+            json.dumps({"name": "my-app", "contributors": ["Isaac Newton <i@n.com>"]})
+        )
+
+        metadata = {}
+        metadata_source = NodeJSMetadataHook(
+            project, config={"contributors-as-maintainers": False}
+        )
+        metadata_source.update(metadata)
+
+        assert metadata == {
+            "name": "my-app",
+            "authors": [{"name": "Isaac Newton", "email": "i@n.com"}],
+        }
+
     def test_labels(self, project):
         # Create a simple project
         (project / "pyproject.toml").write_text(TRIVIAL_PYPROJECT_CONTENTS)
@@ -184,3 +201,173 @@ class TestMetadata:
         metadata_source = NodeJSMetadataHook(project, config=config)
         metadata_source.update(metadata)
         assert metadata == TRIVIAL_EXPECTED_METADATA
+
+    def test_unrequested_fields_not_parsed(self, project):
+        package_content = json.loads(TRIVIAL_PACKAGE_CONTENTS)
+        del package_content["name"]
+        package_content["contributors"] = ["<invalid"]
+        package_content["repository"] = {"type": "git"}
+        (project / "pyproject.toml").write_text(TRIVIAL_PYPROJECT_CONTENTS)
+        (project / "package.json").write_text(json.dumps(package_content))
+
+        metadata = {}
+        metadata_source = NodeJSMetadataHook(project, config={"fields": ["license"]})
+        metadata_source.update(metadata)
+        assert metadata == {"license": "MIT"}
+
+        metadata_source = NodeJSMetadataHook(project, config={})
+        with pytest.raises(KeyError):
+            metadata_source.update({})
+
+    def test_unrequested_members_skipped(self, project):
+        import tracemalloc
+
+        package_content = json.loads(TRIVIAL_PACKAGE_CONTENTS)
+        package_content["dependencies"] = {f"dep-{i}": "^1.0.0" for i in range(50_000)}
+        (project / "pyproject.toml").write_text(TRIVIAL_PYPROJECT_CONTENTS)
+        (project / "package.json").write_text(json.dumps(package_content))
+        size = (project / "package.json").stat().st_size
+
+        metadata_source = NodeJSMetadataHook(project, config={"fields": ["urls"]})
+        assert metadata_source.package_keys == {"homepage", "bugs", "repository"}
+
+        # Peak memory depends on the requested members, not on the file size
+        metadata = {}
+        tracemalloc.start()
+        try:
+            metadata_source.update(metadata)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert metadata == {"urls": TRIVIAL_EXPECTED_METADATA["urls"]}
+        assert peak < size / 10
+
+    def test_cached_package_not_shared(self, project):
+        (project / "package.json").write_text(TRIVIAL_PACKAGE_CONTENTS)
+
+        metadata = {}
+        NodeJSMetadataHook(project, config={}).update(metadata)
+        metadata["keywords"].append("injected")
+        NodeJSMetadataHook(project, config={}).load_package_data()["name"] = "mutated"
+        NodeJSMetadataHook(project, config={}).load_package_metadata()["license"] = ""
+
+        metadata = {}
+        NodeJSMetadataHook(project, config={}).update(metadata)
+        assert metadata == TRIVIAL_EXPECTED_METADATA
+        package = NodeJSMetadataHook(project, config={}).load_package_data()
+        assert package == json.loads(TRIVIAL_PACKAGE_CONTENTS)
+
+    def test_projection_is_shared(self, project):
+        config = {"fields": ["license", "name"]}
+        first = NodeJSMetadataHook(project, config=config)
+        second = NodeJSMetadataHook(project, config=dict(config))
+
+        assert first.projection is second.projection
+        assert [field for field, _ in first.projection] == ["name", "license"]
+
+
+@pytest.fixture
+def workspace(temp_dir, write_package):
+    from hatch_nodejs_version._inherit import inherit_cache_clear
+
+    root = json.loads(TRIVIAL_PACKAGE_CONTENTS)
+    write_package(temp_dir, **root, workspaces=["packages/*"])
+    (temp_dir / "packages").mkdir()
+    yield temp_dir
+    inherit_cache_clear()
+
+
+class TestInherit:
+    def test_inherit(self, workspace, write_package):
+        member = write_package(
+            workspace / "packages" / "a", name="a", license="BSD-3-Clause"
+        )
+
+        metadata = {}
+        NodeJSMetadataHook(member, config={"inherit": True}).update(metadata)
+        assert metadata == {
+            "name": "a",
+            "license": "BSD-3-Clause",
+            "authors": TRIVIAL_EXPECTED_METADATA["authors"],
+            "urls": TRIVIAL_EXPECTED_METADATA["urls"],
+        }
+
+    def test_disabled_by_default(self, workspace, write_package):
+        member = write_package(workspace / "packages" / "a", name="a")
+
+        metadata = {}
+        NodeJSMetadataHook(member, config={}).update(metadata)
+        assert metadata == {"name": "a"}
+
+    def test_nearest_ancestor_wins(self, workspace, write_package):
+        group = write_package(
+            workspace / "packages", name="group", license="Apache-2.0"
+        )
+        member = write_package(group / "a", name="a")
+
+        metadata = {}
+        config = {"inherit": True, "fields": ["license", "keywords"]}
+        NodeJSMetadataHook(member, config=config).update(metadata)
+        # Only the inheritable members are inherited
+        assert metadata == {"license": "Apache-2.0"}
+
+    def test_outside_workspace(self, workspace, write_package):
+        (workspace / "package.json").write_text(TRIVIAL_PACKAGE_CONTENTS)
+        member = write_package(workspace / "packages" / "a", name="a")
+
+        metadata = {}
+        NodeJSMetadataHook(member, config={"inherit": True}).update(metadata)
+        assert metadata == {"name": "a"}
+
+    def test_workspace_root(self, workspace, write_package):
+        nested = write_package(
+            workspace / "packages" / "nested", name="nested", workspaces=["*"]
+        )
+
+        metadata = {}
+        NodeJSMetadataHook(nested, config={"inherit": True}).update(metadata)
+        assert metadata == {"name": "nested"}
+
+    def test_ancestors_read_once(self, workspace, write_package, monkeypatch):
+        from hatch_nodejs_version import cache
+
+        reads = []
+
+        def read_members(path, keys, loads):
+            reads.append(os.path.relpath(path, workspace))
+            return read_members_(path, keys, loads)
+
+        read_members_ = cache.read_members
+        monkeypatch.setattr(cache, "read_members", read_members)
+
+        members = [
+            write_package(workspace / "packages" / f"member-{i}", name=f"member-{i}")
+            for i in range(20)
+        ]
+        for member in members:
+            metadata = {}
+            NodeJSMetadataHook(member, config={"inherit": True}).update(metadata)
+            assert metadata["license"] == "MIT"
+        assert reads.count("package.json") == 1
+        assert len(reads) == 21
+
+    def test_disk_cache(self, workspace, write_package):
+        member = write_package(workspace / "packages" / "a", name="a")
+        config = {"inherit": True, "cache-dir": ".cache", "fields": ["license"]}
+
+        metadata = {}
+        NodeJSMetadataHook(member, config=config).update(metadata)
+        assert metadata == {"license": "MIT"}
+
+        # Changes to the ancestors invalidate the cached metadata
+        root = json.loads((workspace / "package.json").read_text())
+        write_package(workspace, **{**root, "license": "BSD-3-Clause"})
+
+        metadata = {}
+        NodeJSMetadataHook(member, config=config).update(metadata)
+        assert metadata == {"license": "BSD-3-Clause"}
+
+    def test_invalid(self, workspace, write_package):
+        member = write_package(workspace / "packages" / "a", name="a")
+        with pytest.raises(TypeError, match="Option `inherit` for metadata hook"):
+            NodeJSMetadataHook(member, config={"inherit": "yes"}).update({})
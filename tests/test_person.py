@@ -0,0 +1,97 @@
+# SPDX-FileCopyrightText: 2022-present Angus Hollands <goosey15@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+import itertools
+import re
+import time
+
+import pytest
+
+from hatch_nodejs_version._person import (
+    Person,
+    parse_people,
+    parse_person,
+    parse_person_string,
+)
+from hatch_nodejs_version.metadata_source import AUTHOR_PATTERN
+
+
+def regex_parse(person):
+    match = re.match(AUTHOR_PATTERN, person)
+    if match is None:
+        return None
+    return match.group("name", "email")
+
+
+class TestPerson:
+    @pytest.mark.parametrize(
+        "person",
+        [
+            "Barney Rubble <b@rubble.com> (http://barnyrubble.tumblr.com/)",
+            "Barney Rubble (http://barnyrubble.tumblr.com/)",
+            "Barney Rubble <b@rubble.com>",
+            "Barney Rubble",
+            "<b@rubble.com>",
+            "(http://b.com)",
+            "  <b@rubble.com>",
+            "Barney\n",
+            "\n",
+            "",
+            "Barney <b@rubble.com>\n",
+            "Barney <b@rubble.com> trailing",
+            "Barney <>",
+            "Barney <b(@rubble.com>",
+            "Barney ()",
+            "Barney (http://b.com",
+            "Barney <b@rubble.com",
+        ],
+    )
+    def test_matches_pattern(self, person):
+        expected = regex_parse(person)
+        if expected is None:
+            with pytest.raises(ValueError, match="Invalid author name"):
+                parse_person_string(person)
+        else:
+            parsed = parse_person_string(person)
+            assert (parsed.name, parsed.email) == expected
+
+    def test_matches_pattern_exhaustive(self):
+        for n in range(5):
+            for chars in itertools.product("a <>(\t\n)", repeat=n):
+                person = "".join(chars)
+                try:
+                    parsed = parse_person_string(person)
+                except ValueError:
+                    assert regex_parse(person) is None, repr(person)
+                else:
+                    assert (parsed.name, parsed.email) == regex_parse(person)
+
+    def test_linear_time(self):
+        # `AUTHOR_PATTERN` takes cubic time on these inputs
+        person = "a" + " \t" * 100_000 + "x"
+        start = time.perf_counter()
+        assert parse_person_string(person).name == person
+        with pytest.raises(ValueError):
+            parse_person_string(person + "<")
+        assert time.perf_counter() - start < 1
+
+    def test_objects(self):
+        assert parse_person({"name": "Barney", "email": "b@rubble.com"}) == Person(
+            "Barney", "b@rubble.com"
+        )
+        assert parse_person({"name": "Barney", "url": "http://b.com"}) == Person(
+            "Barney"
+        )
+        assert parse_person({"name": "Barney <b@rubble.com>"}) == Person(
+            "Barney", "b@rubble.com"
+        )
+
+    def test_parse_people(self):
+        people = parse_people(["Barney <b@rubble.com>", {"name": "Fred"}] * 2)
+        assert people == [Person("Barney", "b@rubble.com"), Person("Fred")] * 2
+        # Repeated strings share a record
+        assert people[0] is people[2]
+        assert [p.as_dict() for p in people[:2]] == [
+            {"name": "Barney", "email": "b@rubble.com"},
+            {"name": "Fred"},
+        ]
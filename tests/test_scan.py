@@ -0,0 +1,189 @@
+# SPDX-FileCopyrightText: 2022-present Angus Hollands <goosey15@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+import json
+
+import pytest
+
+from hatch_nodejs_version import _scan
+from hatch_nodejs_version._scan import (
+    ScanError,
+    find_member,
+    find_pointer,
+    loads_member,
+    loads_members,
+    parse_pointer,
+    read_member,
+    read_members,
+)
+
+NESTED_PACKAGE_CONTENTS = """
+{
+  "name": "my-app",
+  "files": ["version", "{", "\\\\\\"", {"version": "0.0.0"}],
+  "workspaces": {"packages": [[], {}, [{"a": [1, 2.5e3, null, true]}]]},
+  "ver\\u0073ion": "1.2.3",
+  "dependencies": {"version": "9.9.9"}
+}
+"""
+
+
+class TestScan:
+    def test_find_top_level_member(self):
+        buf = NESTED_PACKAGE_CONTENTS.encode()
+        start, end = find_member(buf, "version")
+        assert json.loads(buf[start:end]) == "1.2.3"
+
+    def test_missing_member(self):
+        assert find_member(b'{"name": "my-app"}', "version") is None
+        assert find_member(b" { } ", "version") is None
+
+    @pytest.mark.parametrize(
+        "contents",
+        [b"[]", b'"version"', b'{"name" "x"}', b'{"name": "x', b'{"files": [}'],
+    )
+    def test_inconclusive(self, contents):
+        with pytest.raises(ScanError):
+            find_member(contents, "version")
+
+    def test_limit(self):
+        buf = b'{"files": ["' + b"x" * 100 + b'"], "version": "1.0.0"}'
+        assert find_member(buf, "version", limit=len(buf)) is not None
+        with pytest.raises(ScanError):
+            find_member(buf, "version", limit=100)
+
+    @pytest.mark.parametrize(
+        "contents",
+        [
+            b'{"version": "1", "files": ["version"], "version": "2"}',
+            b'{"version": "1", "ver\\u0073ion": "2"}',
+            b'{"version": "1", "dependencies": {"version": "3"}, "version": "2"}',
+        ],
+    )
+    def test_last_duplicate_member(self, contents):
+        start, end = find_member(contents, "version")
+        assert contents[start:end] == b'"2"'
+
+    @pytest.mark.parametrize(
+        "contents",
+        [
+            b'{"name": "a", "version": "1.0.0", "x": }',
+            b'{"name": "a", "version": "1.0.0"} trailing',
+        ],
+    )
+    def test_loads_member_skipped_not_validated(self, contents):
+        # Unlike `json.loads`, content after the member is not examined
+        with pytest.raises(ValueError):
+            json.loads(contents)
+        assert loads_member(contents, "version") == "1.0.0"
+
+    @pytest.mark.parametrize("threshold", [0, _scan.MAP_THRESHOLD])
+    def test_read_member_mapped(self, temp_dir, monkeypatch, threshold):
+        # Only files of at least `MAP_THRESHOLD` bytes are mapped
+        mapped = []
+        mmap = _scan.mmap.mmap
+        monkeypatch.setattr(_scan, "MAP_THRESHOLD", threshold)
+        monkeypatch.setattr(
+            _scan.mmap,
+            "mmap",
+            lambda *args, **kwargs: mapped.append(args) or mmap(*args, **kwargs),
+        )
+        path = temp_dir / "package.json"
+        path.write_text(NESTED_PACKAGE_CONTENTS, encoding="utf-8")
+
+        assert read_member(path, "version") == "1.2.3"
+        assert len(mapped) == (threshold == 0)
+
+    def test_stops_at_member(self):
+        # The scan terminates before the trailing garbage
+        assert find_member(b'{"version": "1.0.0", "x": ]]]', "version") is not None
+
+    @pytest.mark.parametrize(
+        "contents",
+        [
+            NESTED_PACKAGE_CONTENTS,
+            '["x"]',
+            "",
+            '{"name": "x"}',
+            '\ufeff{"version": 1}',
+            '{"version": "1", "version": "2"}',
+        ],
+    )
+    def test_read_member_matches_json(self, temp_dir, contents):
+        path = temp_dir / "package.json"
+        path.write_text(contents, encoding="utf-8")
+
+        try:
+            expected = json.loads(contents)["version"]
+        except Exception as exc:
+            with pytest.raises(type(exc)):
+                read_member(path, "version")
+        else:
+            assert read_member(path, "version") == expected
+
+    @pytest.mark.parametrize(
+        "contents",
+        [
+            NESTED_PACKAGE_CONTENTS,
+            '{"name": "a", "dependencies": {"x": "1"}, "name": "b"}',
+            '{"dependencies": {"name": "x"}}',
+            '{"name": NaN, "license": 1e400}',
+        ],
+    )
+    def test_loads_members_matches_json(self, temp_dir, contents):
+        keys = {"name", "version", "license"}
+        expected = {k: v for k, v in json.loads(contents).items() if k in keys}
+        assert loads_members(contents.encode(), keys) == expected
+
+        path = temp_dir / "package.json"
+        path.write_text(contents, encoding="utf-8")
+        assert read_members(path, keys) == expected
+
+    def test_loads_members_skips_values(self):
+        # Unrequested values are not decoded, and need not be valid
+        assert loads_members(b'{"name": "x", "files": [tru]}', {"name"}) == {
+            "name": "x"
+        }
+
+    @pytest.mark.parametrize("contents", [b'["x"]', b'{"name": "x"', b""])
+    def test_loads_members_falls_back(self, contents):
+        try:
+            expected = json.loads(contents)
+        except Exception as exc:
+            with pytest.raises(type(exc)):
+                loads_members(contents, {"name"})
+        else:
+            assert loads_members(contents, {"name"}) == expected
+
+
+@pytest.mark.parametrize(
+    "pointer, expected",
+    [
+        ("/version", '"1"'),
+        ("/a/b", "[1, {}]"),
+        ("/a/b/0", "1"),
+        ("/a/b/1", "{}"),
+        ("/a/~1c~0", "2"),
+        ("/a/b/2", None),
+        ("/a/b/01", None),
+        ("/a/missing", None),
+        ("/version/x", None),
+        ("/d/version", '"4"'),
+    ],
+)
+def test_find_pointer(pointer, expected):
+    data = (
+        b'{"a": {"b": [1, {}], "/c~": 2}, "version": "1", '
+        b'"d": {"version": "3", "version": "4"}}'
+    )
+    span = find_pointer(data, pointer)
+    if expected is None:
+        assert span is None
+    else:
+        assert data[slice(*span)] == expected.encode()
+
+
+@pytest.mark.parametrize("pointer", ["", "version", None])
+def test_parse_pointer_invalid(pointer):
+    with pytest.raises(ValueError, match="Invalid JSON pointer"):
+        parse_pointer(pointer)
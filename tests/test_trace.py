@@ -0,0 +1,101 @@
+# SPDX-FileCopyrightText: 2022-present Angus Hollands <goosey15@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+import json
+
+import pytest
+
+from hatch_nodejs_version import trace
+from hatch_nodejs_version.cache import package_json_cache
+from hatch_nodejs_version.metadata_source import NodeJSMetadataHook
+from hatch_nodejs_version.version_source import NodeJSVersionSource
+
+PACKAGE_CONTENTS = """{
+  "name": "my-app",
+  "version": "1.0.0",
+  "author": "Alice Roberts <alice.roberts@bbc.lol>"
+}
+"""
+
+
+@pytest.fixture
+def records():
+    records = []
+    trace.add_callback(records.append)
+    package_json_cache.cache_clear()
+    yield records
+    trace.remove_callback(records.append)
+
+
+@pytest.fixture
+def package_json(project):
+    path = project / "package.json"
+    path.write_text(PACKAGE_CONTENTS)
+    return path
+
+
+def phases(records):
+    return [(r["operation"], r["phase"]) for r in records]
+
+
+class TestTrace:
+    def test_version_source(self, project, package_json, records):
+        version_source = NodeJSVersionSource(project, config={})
+        version_source.set_version("1.2.3", version_source.get_version_data())
+
+        assert phases(records) == [
+            ("get_version_data", "scan"),
+            ("get_version_data", "convert"),
+            ("set_version", "lock"),
+            ("set_version", "read"),
+            ("set_version", "convert"),
+            ("set_version", "scan"),
+            ("set_version", "write"),
+        ]
+        size = len(PACKAGE_CONTENTS)
+        assert [(r["bytes_read"], r["bytes_written"]) for r in records] == [
+            (size, 0),
+            (0, 0),
+            (0, 0),
+            (size, 0),
+            (0, 0),
+            (0, 0),
+            (0, size),
+        ]
+        assert all(r["path"] == "package.json" for r in records)
+        assert all(r["duration"] >= 0 for r in records)
+
+    def test_metadata_hook(self, project, package_json, records):
+        NodeJSMetadataHook(project, config={}).update({})
+
+        # The nested load is traced as part of the update, and scans the file
+        assert phases(records) == [
+            ("update", "scan"),
+            ("update", "people"),
+        ]
+
+    def test_trace_file_option(self, project, package_json):
+        config = {"trace-file": "trace.jsonl"}
+        NodeJSVersionSource(project, config=config).get_version_data()
+        NodeJSMetadataHook(project, config=config).load_package_data()
+
+        lines = (project / "trace.jsonl").read_text().splitlines()
+        assert [json.loads(line)["operation"] for line in lines] == [
+            "get_version_data",
+            "get_version_data",
+            "load_package_data",
+            "load_package_data",
+        ]
+
+    def test_environment_variable(self, project, package_json, monkeypatch):
+        monkeypatch.setenv(trace.TRACE_ENV_VAR, str(project / "env.jsonl"))
+        package_json_cache.cache_clear()
+        NodeJSVersionSource(project, config={}).get_version_data()
+
+        lines = (project / "env.jsonl").read_text().splitlines()
+        assert [json.loads(line)["phase"] for line in lines] == ["scan", "convert"]
+
+    def test_disabled(self, monkeypatch):
+        monkeypatch.delenv(trace.TRACE_ENV_VAR, raising=False)
+        with trace.session("update", "package.json") as session:
+            assert trace.span("read") is session
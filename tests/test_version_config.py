@@ -1,11 +1,20 @@
 # SPDX-FileCopyrightText: 2022-present Angus Hollands <goosey15@gmail.com>
 #
 # SPDX-License-Identifier: MIT
+import itertools
 import json
+import os
+import re
+import sys
+import time
 
 import pytest
 
-from hatch_nodejs_version.version_source import NodeJSVersionSource
+from hatch_nodejs_version.version_source import (
+    NodeJSVersion,
+    NodeJSVersionSource,
+    VersionConflictError,
+)
 
 GOOD_NODE_PYTHON_VERSIONS = [
     ("1.4.5", "1.4.5"),
@@ -36,6 +45,10 @@ class TestVersion:
             "1.4.5rc.post1@dev2",
             "1.4.5rc0.post1+-bad",
             "1.4.5rc0.post1+bad_",
+            "1.4.5+bad--1",
+            "1.4.5+bad.",
+            "1.4.5prev\u0130ew0",
+            "1.4.5+\u017f",
         ],
     )
     def test_parse_python_incorrect(self, python_version):
@@ -51,12 +64,203 @@ class TestVersion:
             "1.4.5-rc0.post1.dev2",
             "1.4.5-rc0.post1+-bad",
             "1.4.5-rc0.post1+bad_",
+            "1.4.5+bad__1",
+            "1.4.5+bad-",
+            "1.4.5-prev\u0131ew0",
+            "1.4.5+\u212a",
         ],
     )
     def test_parse_node_incorrect(self, node_version):
         with pytest.raises(ValueError, match=".* did not match regex"):
             NodeJSVersionSource.node_version_to_python(node_version)
 
+    @pytest.mark.parametrize("release", ["0.0.0", "1.20.300", "007.0.1"])
+    @pytest.mark.parametrize(
+        "pre",
+        [
+            "",
+            "-a",
+            "-B1",
+            "-rc.2",
+            "-alpha-3",
+            "-dev",
+            "-dev4",
+            "-pre5.dev6",
+            "-c.dev-7",
+        ],
+    )
+    @pytest.mark.parametrize("build", ["", "+1", "+a.b-c_d", "+ABC.0"])
+    def test_conforms_to_packaging(self, release, pre, build):
+        from packaging.version import Version
+
+        node_version = f"{release}{pre}{build}"
+        python_version = NodeJSVersionSource.node_version_to_python(node_version)
+        parsed = Version(python_version)
+
+        # The Python form round-trips, and its normalised form has the same meaning
+        assert (
+            NodeJSVersionSource.node_version_to_python(
+                NodeJSVersionSource.python_version_to_node(python_version)
+            )
+            == python_version
+        )
+        assert NodeJSVersion.from_python(str(parsed)) == NodeJSVersion.from_node(
+            node_version
+        )
+
+    def test_scanner_matches_regex(self):
+        from hatch_nodejs_version.version_source import (
+            NODE_VERSION_PATTERN,
+            PYTHON_VERSION_PATTERN,
+            _parse_node_version,
+            _parse_python_version,
+        )
+
+        # Case-insensitive matching of ASCII letters only, as by `packaging`;
+        # case-insensitive Unicode matching would admit e.g. "İ" for "i"
+        node_regex, python_regex = (
+            re.compile(r"^\s*(?a:" + pattern + r")\s*$", re.VERBOSE | re.IGNORECASE)
+            for pattern in (NODE_VERSION_PATTERN, PYTHON_VERSION_PATTERN)
+        )
+
+        def node_parts(match):
+            pre = match["pre_only"] or match["pre_dev"]
+            prefix = "pre_only_" if match["pre_only"] else "pre_dev_"
+            dev = match["dev_only"] or match["pre_dev"]
+            prefix_dev = "dev_only_" if match["dev_only"] else "pre_dev_"
+            return (
+                *match.group("major", "minor", "patch"),
+                match[f"{prefix}pre_l"] if pre else None,
+                match[f"{prefix}pre_n"] if pre else None,
+                (match[f"{prefix_dev}dev_n"] or "0") if dev else None,
+                match["build"],
+            )
+
+        def python_parts(match):
+            return match.group(
+                "major", "minor", "patch", "pre_l", "pre_n", "dev_n", "local"
+            )
+
+        fragments = [
+            *"-._+1aVx ",
+            "\u00a0",
+            "\u0130",
+            "\u212a",
+            "dev",
+            "rc",
+            "alpha",
+            "pre",
+            "view",
+        ]
+        for size in range(4):
+            for suffix in itertools.product(fragments, repeat=size):
+                suffix = "".join(suffix)
+                for version in (
+                    f"1.2.3{suffix}",
+                    f" v1.2.3{suffix}",
+                    f"1.2.3-{suffix}",
+                ):
+                    for regex, parse, parts in (
+                        (node_regex, _parse_node_version, node_parts),
+                        (python_regex, _parse_python_version, python_parts),
+                    ):
+                        match = regex.match(version)
+                        if match is None:
+                            with pytest.raises(ValueError, match="did not match"):
+                                parse(version)
+                        else:
+                            assert parse(version) == parts(match), version
+
+    def test_parse_linear_time(self):
+        # Inputs that are slow to reject by backtracking
+        for version in (
+            "1.2.3+" + "a." * 50_000 + "-",
+            "1.2.3-rc." + "dev" * 50_000,
+            " " * 50_000 + "1.2.3" + " " * 50_000 + "x",
+        ):
+            start = time.perf_counter()
+            with pytest.raises(ValueError):
+                NodeJSVersionSource.node_version_to_python(version)
+            assert time.perf_counter() - start < 0.5
+
+    def test_batch_conversion(self):
+        node_versions = [n for n, _ in GOOD_NODE_PYTHON_VERSIONS]
+        python_versions = [p for _, p in GOOD_NODE_PYTHON_VERSIONS]
+
+        assert (
+            NodeJSVersionSource.node_versions_to_python(iter(node_versions))
+            == python_versions
+        )
+        assert NodeJSVersionSource.python_versions_to_node(
+            python_versions
+        ) == NodeJSVersionSource.python_versions_to_node(
+            NodeJSVersionSource.node_versions_to_python(node_versions)
+        )
+
+    def test_batch_conversion_error(self):
+        with pytest.raises(ValueError, match="'1.4' did not match regex"):
+            NodeJSVersionSource.node_versions_to_python(["1.4.5", "1.4"])
+
+    @pytest.mark.parametrize(
+        "node_version, python_version",
+        GOOD_NODE_PYTHON_VERSIONS,
+    )
+    def test_version_object(self, node_version, python_version):
+        version = NodeJSVersion.from_node(node_version)
+        assert version.python == python_version
+        assert NodeJSVersion.from_python(python_version) == version
+
+        # Rendering is lossless, up to the separators that Python ignores
+        assert NodeJSVersion.from_node(version.node) == version
+        assert version.node == NodeJSVersionSource.python_version_to_node(
+            python_version
+        )
+
+    def test_version_object_ordering(self):
+        from packaging.version import Version
+
+        node_versions = [
+            "1.4.5",
+            "1.4.5-a0",
+            "1.4.5-a",
+            "1.4.5-alpha2",
+            "1.4.5-b0",
+            "1.4.5-c1",
+            "1.4.5-rc0",
+            "1.4.5-rc0.dev3",
+            "1.4.5-pre2",
+            "1.4.5-dev0",
+            "1.4.5-dev",
+            "1.4.5-a1.dev0",
+            "1.4.5+build.2",
+            "1.4.5+build.10",
+            "1.4.5+build-a",
+            "1.4.5+1",
+            "1.4.10",
+            "1.10.0",
+            "10.0.0-beta1",
+            "2.0.0",
+        ]
+        versions = [NodeJSVersion.from_node(v) for v in node_versions]
+
+        assert [v.python for v in sorted(versions, key=lambda v: v.sort_key)] == [
+            v.python for v in sorted(versions, key=lambda v: Version(v.python))
+        ]
+        assert max(versions).node == "10.0.0-beta1"
+        # Equal (and so deduplicated) according to PEP 440
+        assert NodeJSVersion.from_node("1.4.5-c1") == NodeJSVersion.from_node(
+            "1.4.5-rc1"
+        )
+        assert len({NodeJSVersion.from_node(v) for v in ("1.4.5-a", "1.4.5-a0")}) == 1
+
+    def test_version_object_invalid(self):
+        with pytest.raises(ValueError, match="'1.4' did not match regex"):
+            NodeJSVersion.from_node("1.4")
+        with pytest.raises(TypeError, match="got 'int'"):
+            NodeJSVersion.from_node(1)
+        with pytest.raises(TypeError, match="got 'bytes'"):
+            NodeJSVersion.from_python(b"1.4.0")
+
     @pytest.mark.parametrize(
         "node_version, python_version",
         GOOD_NODE_PYTHON_VERSIONS,
@@ -134,3 +338,259 @@ source = "nodejs"
 
         written_package = json.loads((project / package_json).read_text())
         assert written_package["version"] == node_version
+
+    def test_set_version_preserves_formatting(self, project):
+        contents = (
+            '{\n  "name": "my-app",\n  "version": "0.0.0",\n'
+            '  "files": ["a", {"version": "0.0.0"}]\n}\n'
+        )
+        package_json = project / "package.json"
+        package_json.write_text(contents)
+        package_json.chmod(0o640)
+
+        version_source = NodeJSVersionSource(project, config={})
+        version_source.set_version("1.2.3rc0", version_source.get_version_data())
+
+        assert package_json.read_text() == contents.replace(
+            '"version": "0.0.0",', '"version": "1.2.3-rc0",'
+        )
+        assert package_json.stat().st_mode & 0o777 == 0o640
+        assert sorted(p.name for p in project.iterdir()) == ["my_app", "package.json"]
+        assert version_source.get_version_data() == {"version": "1.2.3rc0"}
+
+    def test_set_version_duplicate_version(self, project):
+        # As with `json.loads`, the last duplicate member is read and written
+        package_json = project / "package.json"
+        package_json.write_text(
+            '{"version": "0.0.1", "name": "my-app", "version": "0.0.2"}'
+        )
+
+        version_source = NodeJSVersionSource(project, config={})
+        assert version_source.get_version_data() == {"version": "0.0.2"}
+        version_source.set_version("1.2.3", version_source.get_version_data())
+
+        assert package_json.read_text() == (
+            '{"version": "0.0.1", "name": "my-app", "version": "1.2.3"}'
+        )
+        assert version_source.get_version_data() == {"version": "1.2.3"}
+
+    def test_set_version_unchanged(self, project):
+        package_json = project / "package.json"
+        package_json.write_text('{"name": "my-app", "version": "1.2.3"}')
+        stat = package_json.stat()
+
+        version_source = NodeJSVersionSource(project, config={})
+        version_source.set_version("1.2.3", version_source.get_version_data())
+
+        assert package_json.stat().st_mtime_ns == stat.st_mtime_ns
+        assert package_json.stat().st_ino == stat.st_ino
+
+    def test_set_version_missing_version(self, project):
+        package_json = project / "package.json"
+        package_json.write_text('{"name": "my-app"}\n')
+
+        version_source = NodeJSVersionSource(project, config={})
+        version_source.set_version("1.2.3", {})
+
+        assert package_json.read_text() == (
+            '{\n    "name": "my-app",\n    "version": "1.2.3"\n}\n'
+        )
+
+    def test_set_version_targets(self, project):
+        (project / "package.json").write_text('{"name": "my-app", "version": "0.0.0"}')
+        extension = project / "my_app" / "labextension"
+        extension.mkdir()
+        (extension / "package.json").write_text(
+            '{\n  "name": "ext",\n  "version": "0.0.0",\n'
+            '  "jupyterlab": {"version": "0.0.0", "a/b": ["x", "0.0.0"]}\n}\n'
+        )
+        (project / "other.json").write_text('{"meta": {}}\n')
+
+        version_source = NodeJSVersionSource(
+            project,
+            config={
+                "targets": [
+                    "my_app/labextension/package.json",
+                    {
+                        "path": "my_app/labextension/package.json",
+                        "pointer": "/jupyterlab/version",
+                    },
+                    {
+                        "path": "my_app/labextension/package.json",
+                        "pointer": "/jupyterlab/a~1b/1",
+                    },
+                    {"path": "other.json", "pointer": "/meta/version"},
+                ]
+            },
+        )
+        version_source.set_version("1.2.3rc0", {})
+
+        assert json.loads((project / "package.json").read_text())["version"] == (
+            "1.2.3-rc0"
+        )
+        assert (extension / "package.json").read_text() == (
+            '{\n  "name": "ext",\n  "version": "1.2.3-rc0",\n'
+            '  "jupyterlab": {"version": "1.2.3-rc0", "a/b": ["x", "1.2.3-rc0"]}\n}\n'
+        )
+        assert json.loads((project / "other.json").read_text()) == {
+            "meta": {"version": "1.2.3-rc0"}
+        }
+
+    def test_set_version_targets_rollback(self, project, monkeypatch):
+        contents = '{"name": "my-app", "version": "0.0.0"}'
+        (project / "package.json").write_text(contents)
+        (project / "a.json").write_text('{"version": "0.0.0"}')
+        (project / "b.json").write_text('{"version": "0.0.0"}')
+
+        import os
+
+        replace = os.replace
+
+        def failing_replace(src, dst):
+            if dst.endswith("b.json"):
+                raise OSError("disk full")
+            replace(src, dst)
+
+        monkeypatch.setattr(os, "replace", failing_replace)
+        version_source = NodeJSVersionSource(
+            project, config={"targets": ["a.json", "b.json"]}
+        )
+        with pytest.raises(OSError, match="disk full"):
+            version_source.set_version("1.2.3", {})
+        monkeypatch.undo()
+
+        assert (project / "package.json").read_text() == contents
+        assert (project / "a.json").read_text() == '{"version": "0.0.0"}'
+        assert (project / "b.json").read_text() == '{"version": "0.0.0"}'
+        assert sorted(p.name for p in project.iterdir()) == [
+            "a.json",
+            "b.json",
+            "my_app",
+            "package.json",
+        ]
+        assert version_source.get_version_data() == {"version": "0.0.0"}
+
+    def test_set_version_symlink(self, project):
+        (project / "js").mkdir()
+        (project / "js" / "package.json").write_text(
+            '{"name": "my-app", "version": "1.0.0"}'
+        )
+        try:
+            os.symlink(os.path.join("js", "package.json"), project / "package.json")
+        except (OSError, NotImplementedError):
+            pytest.skip("symlinks are not supported")
+
+        version_source = NodeJSVersionSource(project, config={})
+        version_source.set_version("2.0.0", version_source.get_version_data())
+
+        assert (project / "package.json").is_symlink()
+        assert json.loads((project / "js" / "package.json").read_text()) == {
+            "name": "my-app",
+            "version": "2.0.0",
+        }
+
+    def test_set_version_targets_unresolved(self, project):
+        contents = '{"name": "my-app", "version": "0.0.0"}'
+        (project / "package.json").write_text(contents)
+        (project / "a.json").write_text('{"version": "0.0.0"}')
+
+        version_source = NodeJSVersionSource(
+            project, config={"targets": [{"path": "a.json", "pointer": "/x/version"}]}
+        )
+        with pytest.raises(ValueError, match="'/x/version' does not resolve"):
+            version_source.set_version("1.2.3", {})
+        assert (project / "package.json").read_text() == contents
+
+    @pytest.mark.parametrize(
+        "targets",
+        ["a.json", [1], [{"pointer": "/version"}], [{"path": "a.json", "x": 1}]],
+    )
+    def test_targets_invalid(self, project, targets):
+        version_source = NodeJSVersionSource(project, config={"targets": targets})
+        with pytest.raises(TypeError, match="Option `targets`"):
+            version_source.targets
+
+    def test_targets_invalid_pointer(self, project):
+        version_source = NodeJSVersionSource(
+            project, config={"targets": [{"path": "a.json", "pointer": "version"}]}
+        )
+        with pytest.raises(ValueError, match="Invalid JSON pointer"):
+            version_source.targets
+
+    def test_set_version_conflict(self, project):
+        contents = '{"name": "my-app", "version": "1.2.3"}'
+        (project / "package.json").write_text(contents)
+
+        version_source = NodeJSVersionSource(project, config={})
+        with pytest.raises(VersionConflictError, match="is '1.2.3', not '1.2.2'"):
+            version_source.set_version("1.3.0", {"version": "1.2.2"})
+        assert (project / "package.json").read_text() == contents
+
+        version_source.set_version("1.3.0", version_source.get_version_data())
+        assert version_source.get_version_data() == {"version": "1.3.0"}
+
+    def test_set_version_concurrent(self, project):
+        from concurrent.futures import ThreadPoolExecutor
+
+        (project / "package.json").write_text('{"name": "my-app", "version": "0.0.0"}')
+
+        def bump(_):
+            version_source = NodeJSVersionSource(project, config={})
+            while True:
+                version_data = version_source.get_version_data()
+                major, minor, patch = version_data["version"].split(".")
+                try:
+                    version_source.set_version(
+                        f"{major}.{minor}.{int(patch) + 1}", version_data
+                    )
+                except VersionConflictError:
+                    continue
+                return
+
+        with ThreadPoolExecutor(8) as executor:
+            list(executor.map(bump, range(40)))
+
+        # No update was lost
+        version_source = NodeJSVersionSource(project, config={})
+        assert version_source.get_version_data() == {"version": "0.0.40"}
+
+    def test_set_version_lock_timeout(self, project):
+        from hatch_nodejs_version._io import lock_directories
+
+        (project / "package.json").write_text('{"name": "my-app", "version": "0.0.0"}')
+        version_source = NodeJSVersionSource(project, config={"lock-timeout": 0.05})
+
+        with lock_directories([str(project)]):
+            with pytest.raises(TimeoutError, match="Timed out waiting for the lock"):
+                version_source.set_version("1.2.3", {})
+        version_source.set_version("1.2.3", {})
+        assert version_source.get_version_data() == {"version": "1.2.3"}
+
+    def test_lock_file_removed(self, project, monkeypatch):
+        import types
+
+        from hatch_nodejs_version._io import LOCK_FILE_NAME, lock_directories
+
+        # Emulate Windows, where a lock file is taken within the directory
+        locked = []
+        msvcrt = types.SimpleNamespace(
+            LK_NBLCK=2, LK_UNLCK=0, locking=lambda fd, mode, n: locked.append(mode)
+        )
+        monkeypatch.setitem(sys.modules, "msvcrt", msvcrt)
+        monkeypatch.setattr(os, "name", "nt")
+        with lock_directories([str(project)]):
+            assert (project / LOCK_FILE_NAME).exists()
+        monkeypatch.undo()
+
+        assert locked == [msvcrt.LK_NBLCK, msvcrt.LK_UNLCK]
+        assert not (project / LOCK_FILE_NAME).exists()
+
+    @pytest.mark.parametrize(
+        "lock_timeout, error", [("1", TypeError), (True, TypeError), (-1, ValueError)]
+    )
+    def test_lock_timeout_invalid(self, project, lock_timeout, error):
+        version_source = NodeJSVersionSource(
+            project, config={"lock-timeout": lock_timeout}
+        )
+        with pytest.raises(error, match="Option `lock-timeout`"):
+            version_source.lock_timeout
@@ -0,0 +1,114 @@
+# SPDX-FileCopyrightText: 2022-present Angus Hollands <goosey15@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+import threading
+import time
+
+import pytest
+
+from hatch_nodejs_version.watch import VersionWatcher
+
+
+@pytest.fixture
+def versions():
+    return []
+
+
+class TestWatch:
+    def test_push(self, temp_dir, write_package, versions):
+        write_package(temp_dir, version="1.0.0-rc1")
+        watcher = VersionWatcher(
+            str(temp_dir), callback=versions.append, target="_version.py", debounce=0
+        )
+
+        assert watcher.poll_once() == "1.0.0rc1"
+        assert versions == ["1.0.0rc1"]
+        namespace = {}
+        exec((temp_dir / "_version.py").read_text(), namespace)
+        assert namespace["__version__"] == "1.0.0rc1"
+
+        # Unchanged
+        assert watcher.poll_once() is None
+
+        write_package(temp_dir, version="1.0.0")
+        assert watcher.poll_once() == "1.0.0"
+        assert versions == ["1.0.0rc1", "1.0.0"]
+
+    def test_unchanged_version_not_pushed(self, temp_dir, write_package, versions):
+        write_package(temp_dir, version="1.0.0")
+        watcher = VersionWatcher(str(temp_dir), callback=versions.append, debounce=0)
+        watcher.poll_once()
+
+        write_package(temp_dir, version="1.0.0", description="Changed")
+        assert watcher.poll_once() is None
+        assert versions == ["1.0.0"]
+
+    def test_stat_coalescing(self, temp_dir, write_package, versions, monkeypatch):
+        write_package(temp_dir, version="1.0.0")
+        watcher = VersionWatcher(str(temp_dir), callback=versions.append, debounce=0)
+        watcher.poll_once()
+
+        calls = []
+        get_version_data = watcher.source.get_version_data
+        monkeypatch.setattr(
+            watcher.source,
+            "get_version_data",
+            lambda: calls.append(None) or get_version_data(),
+        )
+        for _ in range(10):
+            watcher.poll_once()
+        assert calls == []
+
+    def test_debounce(self, temp_dir, write_package, versions):
+        write_package(temp_dir, version="1.0.0")
+        watcher = VersionWatcher(str(temp_dir), callback=versions.append, debounce=0.2)
+        assert watcher.poll_once() is None
+
+        # A burst of writes
+        for version in ("1.0.1", "1.0.22", "1.0.333"):
+            write_package(temp_dir, version=version)
+            assert watcher.poll_once() is None
+
+        time.sleep(0.25)
+        assert watcher.poll_once() == "1.0.333"
+        assert versions == ["1.0.333"]
+
+    def test_errors(self, temp_dir, write_package, versions):
+        errors = []
+        write_package(temp_dir, version="1.0.0")
+        watcher = VersionWatcher(
+            str(temp_dir), callback=versions.append, on_error=errors.append, debounce=0
+        )
+        watcher.poll_once()
+
+        (temp_dir / "package.json").write_text('{"version": "1.0')
+        assert watcher.poll_once() is None
+        assert len(errors) == 1
+
+        # Missing files are not errors
+        (temp_dir / "package.json").unlink()
+        assert watcher.poll_once() is None
+        assert len(errors) == 1
+
+        write_package(temp_dir, version="2.0.0")
+        assert watcher.poll_once() == "2.0.0"
+        assert versions == ["1.0.0", "2.0.0"]
+
+    def test_run(self, temp_dir, write_package):
+        write_package(temp_dir, version="1.0.0")
+        pushed = threading.Event()
+        watcher = VersionWatcher(
+            str(temp_dir),
+            callback=lambda version: version == "2.0.0" and pushed.set(),
+            interval=0.01,
+            debounce=0.01,
+        )
+        thread = threading.Thread(target=watcher.run)
+        thread.start()
+        try:
+            write_package(temp_dir, version="2.0.0")
+            assert pushed.wait(5)
+        finally:
+            watcher.stop()
+            thread.join(5)
+        assert not thread.is_alive()
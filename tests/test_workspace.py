@@ -0,0 +1,57 @@
+# SPDX-FileCopyrightText: 2022-present Angus Hollands <goosey15@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+import pytest
+
+from hatch_nodejs_version.workspace import (
+    WorkspaceMember,
+    find_workspace_members,
+    resolve_workspace,
+)
+
+
+@pytest.fixture
+def workspace(temp_dir, write_package):
+    write_package(
+        temp_dir,
+        name="root",
+        version="0.0.0",
+        workspaces=["packages/*", "!packages/ignored", "tools/**"],
+    )
+    write_package(temp_dir / "packages" / "a", name="a", version="1.0.0-rc1")
+    write_package(
+        temp_dir / "packages" / "b", name="b", version="2.0.0", description="B"
+    )
+    write_package(temp_dir / "packages" / "broken", name="broken", version="2.0")
+    write_package(temp_dir / "packages" / "ignored", name="ignored", version="1.0.0")
+    write_package(temp_dir / "tools" / "nested" / "c", name="c", version="3.0.0")
+    (temp_dir / "packages" / "not-a-package").mkdir()
+    return temp_dir
+
+
+class TestWorkspace:
+    def test_find_members(self, workspace):
+        assert find_workspace_members(workspace) == [
+            "packages/a",
+            "packages/b",
+            "packages/broken",
+            "tools/nested/c",
+        ]
+
+    def test_find_members_object_form(self, temp_dir, write_package):
+        write_package(temp_dir, name="root", workspaces={"packages": ["a"]})
+        write_package(temp_dir / "a", name="a", version="1.0.0")
+        assert find_workspace_members(temp_dir) == ["a"]
+
+    def test_resolve(self, workspace):
+        resolution = resolve_workspace(
+            workspace, metadata_config={"fields": ["description"]}, max_workers=2
+        )
+
+        assert resolution.members == {
+            "packages/a": WorkspaceMember("1.0.0rc1", {}),
+            "packages/b": WorkspaceMember("2.0.0", {"description": "B"}),
+            "tools/nested/c": WorkspaceMember("3.0.0", {}),
+        }
+        assert list(resolution.errors) == ["packages/broken"]
+        assert isinstance(resolution.errors["packages/broken"], ValueError)